@@ -0,0 +1,60 @@
+import itertools
+import time
+
+import numpy as np
+
+from spectrumlab.detectors import Detector
+
+from calculator.config import DETECTOR_PITCH
+from calculator.data import Data, Datum
+from calculator.length import Length
+from tests.utils import emulate_spectrum
+
+
+def run(
+    n_frames: int = 100,
+    n_numbers: int = 2580,
+    widths: tuple[float, ...] = (20, 50, 100),
+    amplitudes: tuple[float, ...] = (50, 2**12),
+    engines: tuple[str, ...] = ('optimize', 'estimate', 'correlation'),
+) -> None:
+    """Compare engines of length calculation on emulated data (in one process).
+
+    Errors of length are relative to the emulated one, timings are per frame.
+    """
+
+    print(f'engines: {n_frames} frames x {n_numbers} numbers')
+    print(f'{"width":<8}{"amplitude":<12}{"engine":<14}{"max |Δl|, мкм":<16}{"rms Δl, мкм":<14}{"time, ms/frame"}')
+    for width, amplitude in itertools.product(widths, amplitudes):
+        deltas = np.random.random(n_frames)
+        data = Data(
+            [
+                Datum(x=spectrum.index, y=spectrum.intensity)
+                for spectrum in (
+                    emulate_spectrum(
+                        delta=delta,
+                        width=width,
+                        amplitude=amplitude,
+                        background=0,
+                        detector=Detector.BLPP369M1,
+                        n_numbers=n_numbers,
+                        n_frames=100,
+                    )
+                    for delta in deltas
+                )
+            ],
+            kind='benchmark',
+        )
+        expected = DETECTOR_PITCH * (n_numbers/2 + deltas)
+
+        for engine in engines:
+            started_at = time.perf_counter()
+            length = Length.calculate(data=data, workers=1, engine=engine)
+            timing = (time.perf_counter() - started_at) / n_frames
+
+            errors = length.value - expected
+            print(f'{width:<8}{amplitude:<12}{engine:<14}{np.max(np.abs(errors)):<16.3f}{np.sqrt(np.mean(errors**2)):<14.3f}{1e3*timing:.3f}')
+
+
+if __name__ == '__main__':
+    run()
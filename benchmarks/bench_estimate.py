@@ -0,0 +1,64 @@
+import itertools
+import time
+
+import numpy as np
+
+from spectrumlab.detectors import Detector
+
+from calculator.config import DETECTOR_PITCH, SMOOTH_WINDOW, THRESHOLD
+from calculator.data import Datum
+from calculator.length.length import find_peaks
+from calculator.length.optimize import estimate, optimize
+from calculator.length.prepared import PreparedDatum
+from tests.utils import emulate_spectrum
+
+
+def run(
+    n_frames: int = 20,
+    n_numbers: int = 2580,
+    widths: tuple[float, ...] = (20, 50, 100),
+    amplitudes: tuple[float, ...] = (50, 100, 2**8, 2**12),
+) -> None:
+    """Validate closed-form `estimate` of peaks against `optimize` on emulated spectra.
+
+    Errors of length are relative to the emulated one, timings are per peak (peaks are found once).
+    """
+
+    print(f'estimate vs optimize: {n_frames} frames x {n_numbers} numbers')
+    print(f'{"width":<8}{"amplitude":<12}{"engine":<10}{"max |Δl|, мкм":<16}{"rms Δl, мкм":<14}{"time, ms/peak"}')
+    for width, amplitude in itertools.product(widths, amplitudes):
+        fits = []
+        for _ in range(n_frames):
+            delta = np.random.random()
+            spectrum = emulate_spectrum(
+                delta=delta,
+                width=width,
+                amplitude=amplitude,
+                background=0,
+                detector=Detector.BLPP369M1,
+                n_numbers=n_numbers,
+                n_frames=100,
+            )
+            datum = PreparedDatum.create(Datum(x=spectrum.index, y=spectrum.intensity).truncate(THRESHOLD))
+            peaks = find_peaks(datum=datum, window=SMOOTH_WINDOW)
+
+            expected = DETECTOR_PITCH * (n_numbers/2 + delta)
+            fits.append((datum, peaks, expected))
+
+        for name, solve in [
+            ('optimize', optimize),
+            ('estimate', estimate),
+        ]:
+            started_at = time.perf_counter()
+            errors = []
+            for datum, peaks, expected in fits:
+                positions = [solve(datum=datum, peak=peak)['x'][0] for peak in peaks]
+                errors.append(DETECTOR_PITCH * (max(positions) - min(positions)) - expected)
+            timing = (time.perf_counter() - started_at) / sum(len(peaks) for _, peaks, _ in fits)
+
+            errors = np.array(errors)
+            print(f'{width:<8}{amplitude:<12}{name:<10}{np.max(np.abs(errors)):<16.3f}{np.sqrt(np.mean(errors**2)):<14.3f}{1e3*timing:.3f}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+def run(
+    module: str = 'calculator.length',
+    n_repeats: int = 5,
+) -> None:
+
+    timings = []
+    for _ in range(n_repeats):
+        started_at = time.perf_counter()
+        subprocess.run([sys.executable, '-c', f'import {module}'], check=True)
+        timings.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    for _ in range(n_repeats):
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+    interpreter = (time.perf_counter() - started_at) / n_repeats
+
+    print(f'import {module}: {n_repeats} repeats (cold interpreter)')
+    print(f'{"median":<10}{np.median(timings) - interpreter:.3f}, s')
+    print(f'{"min":<10}{np.min(timings) - interpreter:.3f}, s')
+
+
+if __name__ == '__main__':
+    run()
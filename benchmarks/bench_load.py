@@ -0,0 +1,80 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from calculator.data import Data
+from calculator.types import Array, U
+
+
+def run(
+    n_frames: int = 200,
+    n_numbers: int = 2580,
+) -> None:
+
+    with tempfile.TemporaryDirectory() as filedir:
+        emulate_files(
+            filedir=os.path.join(filedir, 'sample'),
+            n_frames=n_frames,
+            n_numbers=n_numbers,
+        )
+
+        timings = {}
+        for name, load in [
+            ('legacy', _load_legacy),
+            ('current', Data._load),
+        ]:
+            started_at = time.perf_counter()
+            intensity = np.asarray(load(filedir=filedir, filename='sample'))
+            timings[name] = time.perf_counter() - started_at
+
+            assert intensity.shape == (n_numbers, n_frames)
+
+    print(f'Data._load: {n_frames} frames x {n_numbers} numbers')
+    for name, timing in timings.items():
+        print(f'{name:<10}{timing:.3f}, s')
+    print(f'{"speed up":<10}{timings["legacy"] / timings["current"]:.1f}x')
+
+
+def emulate_files(filedir: str, n_frames: int, n_numbers: int) -> None:
+    os.makedirs(filedir)
+
+    for i in range(n_frames):
+        pd.DataFrame({
+            'wavelength': np.linspace(200, 800, n_numbers),
+            'intensity': 100*np.random.rand(n_numbers),
+            'crystal': 0,
+            'clipped': 0,
+        }).to_csv(
+            os.path.join(filedir, f'sample - {i+1}.txt'),
+            sep='\t',
+            index=False,
+            header=False,
+        )
+
+
+def _load_legacy(filedir: str, filename: str) -> Array[U]:
+    """Loader used before the C engine one (kept for comparison)."""
+
+    data = []
+    for _ in os.listdir(os.path.join(filedir, f'{filename}')):
+
+        filepath = os.path.join(filedir, f'{filename}', _)
+        with open(filepath, 'r') as file:
+            datum = pd.read_csv(
+                file,
+                names=['wavelength', 'intensity', 'crystal', 'clipped'],
+                sep=r'\t',
+                engine='python',
+            )
+
+            data.append(tuple(datum['intensity']))
+
+    dat = pd.DataFrame(np.array(data).T)
+    return dat
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,94 @@
+import time
+from functools import partial
+
+import numpy as np
+from scipy.optimize import OptimizeResult, minimize
+
+from spectrumlab.detectors import Detector
+from spectrumlab.peaks.blink_peaks import BlinkPeak
+
+from calculator.config import SMOOTH_WINDOW, THRESHOLD
+from calculator.data import Datum
+from calculator.length.length import find_peaks
+from calculator.length.optimize import estimate_amplitude, gauss, optimize
+from calculator.types import Array, N, U
+from tests.utils import emulate_spectrum
+
+
+def run(
+    n_frames: int = 50,
+    n_numbers: int = 2580,
+) -> None:
+
+    fits = []
+    for _ in range(n_frames):
+        spectrum = emulate_spectrum(
+            delta=np.random.random(),
+            width=20,
+            amplitude=200,
+            background=0,
+            detector=Detector.BLPP369M1,
+            n_numbers=n_numbers,
+            n_frames=100,
+        )
+        datum = Datum(x=spectrum.index, y=spectrum.intensity).truncate(THRESHOLD)
+
+        for peak in find_peaks(datum=datum, window=SMOOTH_WINDOW):
+            fits.append((datum, peak))
+
+    print(f'optimize: {len(fits)} peaks')
+    positions = {}
+    for name, fit in [
+        ('legacy', _optimize_legacy),
+        ('current', optimize),
+    ]:
+        started_at = time.perf_counter()
+        results = [fit(datum=datum, peak=peak) for datum, peak in fits]
+        timing = (time.perf_counter() - started_at) / len(fits)
+
+        nfev = np.mean([result['nfev'] for result in results])
+        nit = np.mean([result.get('nit', result.get('njev')) for result in results])
+        print(f'{name:<10}{1e3*timing:.2f}, ms/peak; {nit:.1f} iterations; {nfev:.1f} evaluations')
+
+        positions[name] = np.array([result['x'][0] for result in results])
+
+    print(f'{"max |Δx0|":<10}{np.max(np.abs(positions["legacy"] - positions["current"])):.4f}')
+
+
+def _optimize_legacy(
+    datum: Datum,
+    peak: BlinkPeak,
+) -> OptimizeResult:
+    """Optimizer used before the least squares one (kept for comparison)."""
+
+    def loss(x: Array[N], y: Array[U], params) -> float:
+        y_hat = gauss(x, *params[:3]) + params[3]
+
+        return np.sqrt(np.nansum((y - y_hat)**2))
+
+    position = np.mean(peak.maxima)
+    amplitude = estimate_amplitude(
+        datum=datum,
+        peak=peak,
+    )
+    result = minimize(
+        partial(loss, datum.x[peak.number], datum.y[peak.number]),
+        x0=[
+            position,
+            SMOOTH_WINDOW,
+            amplitude,
+            np.nanpercentile(datum.y, 50),
+        ],
+        bounds=[
+            (position-100, position+100),
+            (10, None),
+            (0, None),
+            (np.nanpercentile(datum.y, 0), np.nanpercentile(datum.y, 50)),
+        ],
+    )
+
+    return result
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,162 @@
+import dataclasses
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import get_args
+from unittest import mock
+
+import numpy as np
+
+from calculator import __version__
+from calculator.config import SMOOTH_WINDOW, THRESHOLD, Config, DataKind
+from calculator.data import Data, Datum
+from calculator.length import LengthMap
+from calculator.length.length import find_peaks, kernel, smooth_intensity
+from calculator.length.optimize import optimize
+from calculator.report import Report
+from scripts import emulate
+
+SAMPLE_NAME = 'benchmark'
+RESULTS_DIRPATH = os.path.join(os.path.dirname(__file__), 'results')
+ROOT_MODULES = (  # modules resolving paths to data by `ROOT`
+    'calculator.config.config',
+    'calculator.data.data',
+    'calculator.length.cache',
+    'calculator.report.report',
+    'scripts.emulate',
+)
+
+
+def run(
+    n_frames: int = 100,
+    n_repeats: int = 5,
+    filedir: str = RESULTS_DIRPATH,
+) -> dict[str, dict[str, float]]:
+    """Time stages of calculation on emulated sample and save timings (in seconds) to json file.
+
+    Sample is emulated in temporary root directory, so samples of data directory are not touched.
+    Results are saved to file named by date and commit, so previous results are kept.
+    """
+
+    with temporary_root() as root:
+        emulate_sample(n_frames=n_frames)
+        timings = time_stages(root=root, n_repeats=n_repeats)
+
+    print(f'stages: {n_frames} frames; {n_repeats} repeats')
+    for name, timing in timings.items():
+        print(f'{name:<20}{1e3*timing["median"]:.3f}, ms')
+
+    now = datetime.now()
+    commit = get_commit()
+
+    os.makedirs(filedir, exist_ok=True)
+    filepath = os.path.join(filedir, f'{now:%Y%m%dT%H%M%S}-{commit}.json')
+    with open(filepath, 'w') as file:
+        json.dump({
+            'version': __version__,
+            'commit': commit,
+            'datetime': now.isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'n_frames': n_frames,
+            'n_repeats': n_repeats,
+            'timings': timings,
+        }, file, indent=4)
+    print(f'saved to {filepath}')
+
+    return timings
+
+
+@contextmanager
+def temporary_root() -> Iterator[Path]:
+    """Patch `ROOT` of modules by temporary directory."""
+
+    with tempfile.TemporaryDirectory() as root, ExitStack() as stack:
+        for module in ROOT_MODULES:
+            stack.enter_context(mock.patch(f'{module}.ROOT', Path(root)))
+
+        yield Path(root)
+
+
+def get_commit() -> str:
+    """Get short hash of current commit (or 'unknown' out of git repository)."""
+
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(__file__),
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def emulate_sample(n_frames: int) -> None:
+    """Emulate all kinds of data and config of sample."""
+
+    for kind in get_args(DataKind):
+        emulate.run(
+            n_iters=n_frames,
+            sample_name=SAMPLE_NAME,
+            filename=Data._get_filename(SAMPLE_NAME, kind),
+        )
+
+    config = Config(**{field.name: 1 for field in dataclasses.fields(Config)})
+    config.save(SAMPLE_NAME)
+
+
+def time_stages(root: Path, n_repeats: int) -> dict[str, dict[str, float]]:
+    filedir = os.path.join(root, 'data', SAMPLE_NAME)
+
+    data = Data.load(SAMPLE_NAME, kind='sample', cache=False)
+    x = data[0].x
+    y = np.array(data.stack().T)
+    y[y >= THRESHOLD] = np.nan
+
+    datum = Datum(x=x, y=y[0])
+    peaks = find_peaks(datum=datum, window=SMOOTH_WINDOW)
+
+    report = Report.create(sample_name=SAMPLE_NAME, config=Config.load(SAMPLE_NAME))
+
+    stages = {
+        'Data._load': lambda: Data._load(filedir=filedir, filename=SAMPLE_NAME),
+        'smooth_intensity': lambda: smooth_intensity(x=x, y=y, window=SMOOTH_WINDOW),
+        'find_peaks': lambda: find_peaks(datum=datum, window=SMOOTH_WINDOW),
+        'optimize': lambda: [optimize(datum=datum, peak=peak) for peak in peaks],
+        'kernel': lambda: kernel(datum=datum),
+        'LengthMap.calculate': lambda: LengthMap.calculate(SAMPLE_NAME, workers=1, cache=False),
+        'Report.publish': lambda: report.publish(),
+    }
+
+    return {
+        name: measure(func, n_repeats=n_repeats)
+        for name, func in stages.items()
+    }
+
+
+def measure(func: Callable[[], object], n_repeats: int) -> dict[str, float]:
+    """Measure min and median time of `n_repeats` calls of function."""
+
+    timings = []
+    for _ in range(n_repeats):
+        started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started_at)
+
+    return {
+        'min': min(timings),
+        'median': float(np.median(timings)),
+    }
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,30 @@
+import time
+from unittest import mock
+
+import numpy as np
+
+from calculator.curvature import Curvature
+from calculator.length import Length
+from calculator.stats import Stats
+from calculator.stress import Stress
+
+
+def run(
+    n_values: int = 10**6,
+    n_reads: int = 100,
+) -> None:
+
+    print(f'stats: {n_values} values; {n_reads} reads')
+    for cls in [Length, Curvature, Stress]:
+        item = cls(value=np.random.randn(n_values))
+
+        with mock.patch.object(Stats, 'calculate', wraps=Stats.calculate) as calculate:
+            started_at = time.perf_counter()
+            reads = [(item.stats.value, item.stats.interval) for _ in range(n_reads)]
+            timing = (time.perf_counter() - started_at) / n_reads
+
+        print(f'{cls.__name__:<10}{1e3*timing:.3f}, ms/read; {calculate.call_count} calculations; {len(reads)} reads')
+
+
+if __name__ == '__main__':
+    run()
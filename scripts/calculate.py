@@ -0,0 +1,94 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from calculator import ROOT
+from calculator.config import Config
+from calculator.progress import disable as disable_progress, progress_bar
+from calculator.report import Report
+from calculator.types import SampleName
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(
+        prog='calculate',
+        description='Calculate and publish reports of samples.',
+    )
+    parser.add_argument(
+        'samples',
+        nargs='+',
+        help='names or glob patterns of samples in data directory',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count(),
+        help='number of samples processed in parallel',
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='calculate new files only and append them to stored results',
+    )
+    args = parser.parse_args()
+
+    sample_names = find_samples(args.samples)
+    if not sample_names:
+        parser.error('No samples found!')
+
+    errors = {}
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(process, sample_name=sample_name, incremental=args.incremental): sample_name
+            for sample_name in sample_names
+        }
+
+        with progress_bar(total=len(futures), desc='samples') as progress:
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as error:
+                    errors[futures[future]] = error
+
+                progress.update()
+
+    for sample_name, error in errors.items():
+        print(f'{sample_name}: {error!r}', file=sys.stderr)
+
+    sys.exit(1 if errors else 0)
+
+
+def find_samples(patterns: list[str]) -> list[SampleName]:
+    """Find names of samples in data directory by names or glob patterns."""
+    filedir = ROOT / 'data'
+
+    sample_names = []
+    for pattern in patterns:
+        for path in sorted(filedir.glob(pattern)):
+            if path.is_dir() and path.name not in sample_names:
+                sample_names.append(SampleName(path.name))
+
+    return sample_names
+
+
+def process(sample_name: SampleName, incremental: bool = False) -> None:
+    """Calculate and publish report of sample in worker process.
+
+    Samples are processed in parallel already, so sample is calculated in one process without progress bars.
+    """
+    disable_progress()
+
+    config = Config.load(sample_name)
+
+    report = Report.create(
+        sample_name=sample_name,
+        config=config,
+        incremental=incremental,
+        workers=1,
+    )
+    report.publish()
+
+
+if __name__ == '__main__':
+    run()
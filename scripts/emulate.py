@@ -11,8 +11,9 @@ from tests.utils import emulate_spectrum
 def run(
     n_iters: int = 10,
     sample_name: str = 'test',
+    filename: str | None = None,
 ) -> None:
-    filedir = ROOT / 'data' / sample_name / sample_name
+    filedir = ROOT / 'data' / sample_name / (filename or sample_name)
     if filedir.exists():
         shutil.rmtree(filedir)
     filedir.mkdir(parents=True)
@@ -23,6 +24,7 @@ def run(
         width=100,
         amplitude=4,
         background=0,
+        detector=detector,
         n_numbers=detector.config.shape[-1],
         n_frames=100,
     )
@@ -35,7 +37,7 @@ def run(
             'clipped': 0,
         }).to_csv(
             filedir / '{sample_name} - {i}.txt'.format(
-                sample_name=sample_name,
+                sample_name=filename or sample_name,
                 i=i+1,
             ),
             sep='\t',
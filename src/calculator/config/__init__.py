@@ -41,11 +41,55 @@ def _parse_smooth_window() -> float:
     return float(value)
 
 
+def _parse_cache() -> bool:
+    default = True
+
+    value = os.environ.get('CACHE', None)
+    if value is None:
+        return default
+
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def _parse_workers() -> int:
+    default = 1
+
+    value = os.environ.get('WORKERS', None)
+    if value is None:
+        return default
+
+    return max(int(value), 1)
+
+
+def _parse_profile() -> bool:
+    default = False
+
+    value = os.environ.get('PROFILE', None)
+    if value is None:
+        return default
+
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def _parse_progress() -> str:
+    default = 'auto'
+
+    value = os.environ.get('PROGRESS', None) or default
+    if value not in ('auto', 'notebook', 'console', 'none'):
+        raise ValueError(f'Progress {value!r} is not supported!')
+
+    return value
+
+
 VERSION = _parse_version()
 
 DETECTOR_PITCH = _parse_detector_pitch()  # detector's width
 THRESHOLD = _parse_threshold()  # detector's max output signal
 SMOOTH_WINDOW = _parse_smooth_window()  # 
+CACHE = _parse_cache()  # cache loaded data on disk
+WORKERS = _parse_workers()  # number of worker processes to calculate length
+PROFILE = _parse_profile()  # profile stages of calculation
+PROGRESS = _parse_progress()  # kind of progress bars
 
 
 match VERSION:
@@ -64,7 +108,11 @@ match VERSION:
 __all__ = [
     Config,
     DataKind,
+    CACHE,
     DETECTOR_PITCH,
+    PROFILE,
+    PROGRESS,
     THRESHOLD,
     VERSION,
+    WORKERS,
 ]
@@ -2,18 +2,14 @@ from dataclasses import dataclass
 
 from calculator.config import Config, VERSION
 from calculator.length import LengthMap
-from calculator.stats import Stats
+from calculator.stats import StatsMixin
 from calculator.types import Array, ReciprocalMeter
 
 
 @dataclass(frozen=True, slots=True)
-class Curvature:
+class Curvature(StatsMixin):
     value: ReciprocalMeter | Array[ReciprocalMeter]
 
-    @property
-    def stats(self) -> Stats:
-        return Stats.calculate(self.value)
-
     @classmethod
     def calculate(cls, length: LengthMap, config: Config) -> 'Curvature':
 
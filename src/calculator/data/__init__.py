@@ -1,7 +1,8 @@
-from .data import Data, Datum
+from .data import Data, Datum, MappedData
 
 
 __all__ = [
     Data,
     Datum,
+    MappedData,
 ]
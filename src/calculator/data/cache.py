@@ -0,0 +1,89 @@
+import json
+import os
+import warnings
+
+import numpy as np
+
+from calculator.types import Array, U
+
+CACHE_DIRNAME = '.cache'
+
+Key = list[tuple[str, int, int]]
+
+
+def make_key(dirpath: str, filenames: list[str]) -> Key:
+    """Make cache key from names, sizes and modification times of files."""
+
+    key = []
+    for filename in filenames:
+        stat = os.stat(os.path.join(dirpath, filename))
+        key.append((filename, stat.st_size, stat.st_mtime_ns))
+
+    return key
+
+
+def load_cache(filedir: str, filename: str, key: Key, mmap: bool = False) -> Array[U] | None:
+    """Load cached (n_numbers, n_frames) intensity array if files are not changed."""
+    filepath = os.path.join(filedir, CACHE_DIRNAME, filename)
+
+    try:
+        with open(f'{filepath}.json', 'r') as file:
+            cached_key = [tuple(item) for item in json.load(file)]
+        intensity = np.load(f'{filepath}.npy', mmap_mode='r' if mmap else None)
+    except (OSError, ValueError):
+        return None
+
+    if sorted(cached_key) != sorted(key) or intensity.shape[-1] != len(cached_key):
+        return None
+
+    if cached_key != key:  # files are listed in another order
+        index = {item: i for i, item in enumerate(cached_key)}
+        intensity = intensity[:, [index[item] for item in key]]
+
+    return intensity
+
+
+def dump_cache(filedir: str, filename: str, key: Key, intensity: Array[U]) -> None:
+    """Dump (n_numbers, n_frames) intensity array to cache."""
+    filepath = os.path.join(filedir, CACHE_DIRNAME, filename)
+
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        with open(f'{filepath}.npy.tmp', 'wb') as file:
+            np.save(file, intensity)
+        os.replace(f'{filepath}.npy.tmp', f'{filepath}.npy')
+
+        with open(f'{filepath}.json.tmp', 'w') as file:
+            json.dump(key, file)
+        os.replace(f'{filepath}.json.tmp', f'{filepath}.json')
+
+    except OSError as error:
+        warnings.warn(f'Cache of {filename!r} is not saved: {error}', stacklevel=2)
+
+
+def create_cache(filedir: str, filename: str, shape: tuple[int, int]) -> Array[U]:
+    """Create memory-mapped (n_numbers, n_frames) intensity array in cache to be filled."""
+    filepath = os.path.join(filedir, CACHE_DIRNAME, filename)
+
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    if os.path.isfile(f'{filepath}.json'):
+        os.remove(f'{filepath}.json')  # invalidate cache until it is filled
+
+    return np.lib.format.open_memmap(
+        f'{filepath}.npy',
+        mode='w+',
+        dtype=np.float64,
+        shape=shape,
+        fortran_order=True,
+    )
+
+
+def commit_cache(filedir: str, filename: str, key: Key, intensity: np.memmap) -> None:
+    """Flush filled memory-mapped intensity array and validate cache."""
+    filepath = os.path.join(filedir, CACHE_DIRNAME, filename)
+
+    intensity.flush()
+    with open(f'{filepath}.json.tmp', 'w') as file:
+        json.dump(key, file)
+    os.replace(f'{filepath}.json.tmp', f'{filepath}.json')
@@ -1,14 +1,15 @@
 import os
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-from typing import Sequence
+from functools import partial
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 
 from calculator import ROOT
-from calculator.config import DataKind
-from calculator.types import Array, Frame, N, SampleName, U
+from calculator.config import CACHE, DataKind
+from calculator.data.cache import commit_cache, create_cache, dump_cache, load_cache, make_key
+from calculator.profiler import profiler
+from calculator.types import Array, N, SampleName, U
 
 
 @dataclass(frozen=True, slots=True)
@@ -18,6 +19,7 @@ class Datum:
     y: Array[U]
 
     def show(self) -> None:
+        import matplotlib.pyplot as plt
 
         plt.plot(
             self.x, self.y,
@@ -31,7 +33,7 @@ class Datum:
         y_truncated[self.y >= __max_value] = np.nan
 
         return Datum(
-            x=np.array(self.x),
+            x=self.x,  # is shared
             y=y_truncated,
         )
 
@@ -57,40 +59,254 @@ class Data(tuple):
         self.kind = kind
 
     @classmethod
-    def load(cls, sample_name: SampleName, kind: DataKind) -> 'Data':
-        filename = {
+    def load(
+        cls,
+        sample_name: SampleName,
+        kind: DataKind,
+        cache: bool = CACHE,
+        filenames: Sequence[str] | None = None,
+        listing: Sequence[str] | None = None,
+    ) -> 'Data':
+        """Load data of selected kind of sample.
+
+        If `filenames` are given, only these files are loaded (without cache).
+        If `listing` of directory is given (is listed already), files of it are loaded, so data are consistent with it.
+        """
+        filename = cls._get_filename(sample_name, kind)
+
+        with profiler.timer('load'):
+            if filenames is None:
+                intensity = cls._load(
+                    filedir=os.path.join(ROOT, 'data', sample_name),
+                    filename=filename,
+                    cache=cache,
+                    filenames=listing,
+                )
+            else:
+                dirpath = cls.get_dirpath(sample_name, kind)
+                intensity = read_intensities([os.path.join(dirpath, _) for _ in filenames])
+
+        return cls.create(intensity, kind=filename)
+
+    @classmethod
+    def create(cls, intensity: Array[U], kind: DataKind, x: Array[N] | None = None) -> 'Data':
+        """Create data of (n_numbers, n_frames) intensity array.
+
+        Datum are views of columns of intensity with one shared read-only `x`.
+        """
+        n_numbers, n_frames = intensity.shape
+        x = create_x(n_numbers) if x is None else x
+
+        return cls(
+            [Datum(x=x, y=intensity[:, i]) for i in range(n_frames)],
+            kind=kind,
+        )
+
+    def stack(self) -> Array[U]:
+        """Stack intensity of all datum to (n_numbers, n_frames) array."""
+
+        return np.stack([datum.y for datum in self]).T
+
+    def truncate(self, __max_value: U) -> 'Data':
+        """Truncate all datum at once: values not less than `__max_value` are set to NaN.
+
+        Intensity is copied once (by stacking), datum of truncated data share `x` with data.
+        """
+        if len(self) == 0:
+            return self
+
+        return self.create(
+            truncate(self.stack(), __max_value, copy=False),
+            kind=self.kind,
+            x=self[0].x,
+        )
+
+    @classmethod
+    def get_dirpath(cls, sample_name: SampleName, kind: DataKind) -> str:
+        """Get path to directory with files of selected kind of sample."""
+
+        return os.path.join(ROOT, 'data', sample_name, cls._get_filename(sample_name, kind))
+
+    @staticmethod
+    def _get_filename(sample_name: SampleName, kind: DataKind) -> str:
+
+        return {
             'sample': sample_name,
             'ref-standard': 'le',
             'flat-standard': 'l0',
             'h': 'h',
         }[kind]
 
-        dat = cls._load(
+    @staticmethod
+    def _load(
+        filedir: str,
+        filename: str,
+        cache: bool = False,
+        mmap: bool = False,
+        filenames: Sequence[str] | None = None,
+    ) -> Array[U]:
+        """Load intensity of all files to (n_numbers, n_frames) array.
+
+        If `mmap` is set, the array is memory-mapped from the cache.
+        If `filenames` (listing of directory) are not given, directory is listed.
+        """
+        dirpath = os.path.join(filedir, f'{filename}')
+        filenames = os.listdir(dirpath) if filenames is None else list(filenames)
+        filepaths = [os.path.join(dirpath, _) for _ in filenames]
+        if not filepaths:
+            return np.empty((0, 0))
+
+        if not (cache or mmap):
+            return read_intensities(filepaths)
+
+        key = make_key(dirpath, filenames)
+
+        intensity = load_cache(filedir, filename, key=key, mmap=mmap)
+        if intensity is not None:
+            return intensity
+
+        if mmap:
+            intensity = read_intensities(filepaths, allocate=partial(create_cache, filedir, filename))
+            commit_cache(filedir, filename, key=key, intensity=intensity)
+
+            return load_cache(filedir, filename, key=key, mmap=True)
+
+        intensity = read_intensities(filepaths)
+        dump_cache(filedir, filename, key=key, intensity=intensity)
+
+        return intensity
+
+
+class MappedData(Sequence[Datum]):
+    """Data backed by one memory-mapped (n_numbers, n_frames) intensity array.
+
+    Datum are created on access as zero-copy views with a shared `x` axis (or as truncated copies, see `truncate`).
+    """
+
+    def __init__(self, __intensity: Array[U], kind: DataKind, x: Array[N] | None = None, max_value: U | None = None):
+
+        self.intensity = __intensity
+        self.x = create_x(__intensity.shape[0]) if x is None else x
+        self.kind = kind
+        self.max_value = max_value  # values not less than are set to NaN on access
+
+    @classmethod
+    def load(cls, sample_name: SampleName, kind: DataKind) -> 'MappedData':
+        filename = Data._get_filename(sample_name, kind)
+
+        intensity = Data._load(
             filedir=os.path.join(ROOT, 'data', sample_name),
             filename=filename,
+            mmap=True,
         )
 
         return cls(
-            [Datum(x=dat.index, y=dat[column]) for column in dat.columns],
+            intensity,
             kind=filename,
         )
 
-    @staticmethod
-    def _load(filedir: str, filename: str) -> Frame:
-
-        data = []
-        for _ in os.listdir(os.path.join(filedir, f'{filename}')):
-
-            filepath = os.path.join(filedir, f'{filename}', _)
-            with open(filepath, 'r') as file:
-                datum = pd.read_csv(
-                    file,
-                    names=['wavelength', 'intensity', 'crystal', 'clipped'],
-                    sep=r'\t',
-                    engine='python',
-                )
+    def stack(self) -> Array[U]:
+        """Return (n_numbers, n_frames) intensity array (without copy, if data are not truncated)."""
+        if self.max_value is None:
+            return self.intensity
+
+        return truncate(self.intensity, self.max_value)
+
+    def truncate(self, __max_value: U) -> 'MappedData':
+        """Truncate all datum lazily: values not less than `__max_value` are set to NaN on access.
+
+        Mapped intensity is not loaded to memory at once, each datum is truncated on access (see `__getitem__`).
+        """
+        max_value = __max_value if self.max_value is None else min(self.max_value, __max_value)
+
+        return self.__class__(
+            self.intensity,
+            kind=self.kind,
+            x=self.x,
+            max_value=max_value,
+        )
+
+    def __len__(self) -> int:
+        return self.intensity.shape[1]
+
+    def __getitem__(self, index: int | slice) -> 'Datum | MappedData':
+        cls = self.__class__
+
+        if isinstance(index, slice):
+            return cls(
+                self.intensity[:, index],
+                kind=self.kind,
+                x=self.x,
+                max_value=self.max_value,
+            )
+
+        y = self.intensity[:, index]
+        if self.max_value is not None:
+            y = truncate(y, self.max_value)
+
+        return Datum(
+            x=self.x,
+            y=y,
+        )
+
+
+def create_x(n_numbers: int) -> Array[N]:
+    """Create read-only index of numbers shared by all datum."""
+
+    x = np.arange(n_numbers)
+    x.flags.writeable = False
+
+    return x
+
+
+def truncate(intensity: Array[U], max_value: U, copy: bool = True) -> Array[U]:
+    """Copy (n_numbers, n_frames) intensity array and set values not less than `max_value` to NaN.
+
+    If not `copy`, intensity is truncated in place (if it is writable float array, else it is copied anyway).
+    """
+    intensity = np.array(intensity, dtype=float, order='F', copy=True if copy else None)
+    if not intensity.flags.writeable:
+        intensity = np.array(intensity, order='F')
+
+    intensity[intensity >= max_value] = np.nan
+
+    return intensity
+
+
+def _allocate(shape: tuple[int, int]) -> Array[U]:
+    return np.empty(shape, order='F')  # frames are contiguous columns
+
+
+def read_intensities(
+    filepaths: Sequence[str],
+    allocate: Callable[[tuple[int, int]], Array[U]] = _allocate,
+) -> Array[U]:
+    """Read intensity of files to preallocated (n_numbers, n_frames) array."""
+    if not filepaths:
+        return np.empty((0, 0))
+
+    intensity = None
+    for i, filepath in enumerate(filepaths):
+        y = read_intensity(filepath)
+
+        if intensity is None:
+            intensity = allocate((len(y), len(filepaths)))
+        intensity[:, i] = y
+
+    return intensity
+
+
+def read_intensity(filepath: str) -> Array[U]:
+    """Read intensity column only from measurement file."""
+    import pandas as pd  # is not required by worker processes
 
-                data.append(tuple(datum['intensity']))
+    frame = pd.read_csv(
+        filepath,
+        sep='\t',
+        header=None,
+        usecols=[1],
+        dtype=np.float64,
+        engine='c',
+    )
 
-        dat = pd.DataFrame(np.array(data).T)
-        return dat
+    return frame.to_numpy()[:, 0]
@@ -1,7 +1,9 @@
 from .length import Length, LengthMap
 from .optimize import gauss
+from .params import Params
 
 __all__ = [
     Length, LengthMap,
+    Params,
     gauss,
 ]
@@ -0,0 +1,95 @@
+import numpy as np
+
+from calculator.length.optimize import gauss, gauss_jacobian
+from calculator.types import Array, N, U
+
+N_ITERS_MAX = 100
+FTOL = 1e-10
+XTOL = 1e-10
+
+
+def optimize_batch(
+    x: Array[N],
+    y: Array[U],
+    x0: Array[float],
+    lower: Array[float],
+    upper: Array[float],
+    n_iters: int = N_ITERS_MAX,
+) -> tuple[Array[float], Array[bool]]:
+    """Fit each row of `y` by gauss with background by vectorized Levenberg-Marquardt iterations.
+
+    `x` and `y` are (..., n) arrays, NaN samples of `y` are masked;
+    `x0`, `lower` and `upper` are (..., 4) arrays of (position, width, amplitude, background).
+    Returns (..., 4) array of parameters and success flags of fits.
+    """
+    shape = y.shape[:-1]
+    n = y.shape[-1]
+
+    x = np.broadcast_to(x, y.shape).reshape(-1, n)
+    y = y.reshape(-1, n)
+    mask = np.isfinite(y)
+    y = np.where(mask, y, 0)
+    x0 = np.broadcast_to(x0, shape + (4, )).reshape(-1, 4)
+    lower = np.broadcast_to(lower, shape + (4, )).reshape(-1, 4)
+    upper = np.broadcast_to(upper, shape + (4, )).reshape(-1, 4)
+
+    params = np.clip(x0, lower, upper)
+    cost = _cost(params, x=x, y=y, mask=mask)
+    damping = np.full(len(params), 1e-3)
+    success = np.zeros(len(params), dtype=bool)
+
+    active = np.ones(len(params), dtype=bool)
+    for _ in range(n_iters):
+        index = np.flatnonzero(active)
+        if len(index) == 0:
+            break
+
+        residuals = _residuals(params[index], x=x[index], y=y[index], mask=mask[index])
+        jac = _jacobian(params[index], x=x[index], mask=mask[index])
+
+        hessian = np.einsum('bni,bnj->bij', jac, jac)
+        gradient = np.einsum('bni,bn->bi', jac, residuals)
+
+        diagonal = np.diagonal(hessian, axis1=1, axis2=2)
+        hessian[:, np.arange(4), np.arange(4)] += damping[index, np.newaxis] * (diagonal + 1e-12*(1 + diagonal.max(axis=1, keepdims=True)))
+        step = np.linalg.solve(hessian, -gradient[..., np.newaxis])[..., 0]
+
+        candidate = np.clip(params[index] + step, lower[index], upper[index])
+        candidate_cost = _cost(candidate, x=x[index], y=y[index], mask=mask[index])
+
+        improved = candidate_cost < cost[index]
+        converged = (
+            (improved & (cost[index] - candidate_cost <= FTOL*cost[index])) |
+            np.all(np.abs(candidate - params[index]) <= XTOL*(XTOL + np.abs(params[index])), axis=1)
+        )
+
+        params[index[improved]] = candidate[improved]
+        cost[index[improved]] = candidate_cost[improved]
+        damping[index] = np.where(improved, np.maximum(damping[index]/10, 1e-12), damping[index]*10)
+
+        success[index[converged]] = True
+        active[index[converged | (damping[index] > 1e12)]] = False
+
+    return params.reshape(shape + (4, )), success.reshape(shape)
+
+
+def _residuals(params: Array[float], x: Array[N], y: Array[U], mask: Array[bool]) -> Array[U]:
+    x0, width, amplitude, background = (params[:, [i]] for i in range(4))
+
+    return np.where(mask, gauss(x, x0, width, amplitude) + background - y, 0)
+
+
+def _jacobian(params: Array[float], x: Array[N], mask: Array[bool]) -> Array[U]:
+    x0, width, amplitude, _ = (params[:, [i]] for i in range(4))
+
+    jac = np.ones(x.shape + (4, ))
+    jac[..., :3] = gauss_jacobian(x, x0, width, amplitude)
+    jac[~mask] = 0
+
+    return jac
+
+
+def _cost(params: Array[float], x: Array[N], y: Array[U], mask: Array[bool]) -> Array[float]:
+    residuals = _residuals(params, x=x, y=y, mask=mask)
+
+    return (1/2)*np.sum(residuals**2, axis=1)
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import time
+import warnings
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from calculator import ROOT, VERSION
+from calculator.config import DETECTOR_PITCH, SMOOTH_WINDOW, THRESHOLD
+from calculator.data.cache import CACHE_DIRNAME, make_key
+from calculator.types import Array, MicroMeter, SampleName
+
+CACHE_FILENAME = 'length.json'
+CACHE_SIZE_MAX = 2**16  # max number of cached lengths
+
+
+@dataclass(frozen=True, slots=True)
+class Lookup:
+    """Lengths of files found in cache (None if not found)."""
+
+    keys: Sequence[str]
+    values: Sequence[MicroMeter | None]
+
+    @property
+    def missing(self) -> list[int]:
+        """Indices of files not found in cache."""
+
+        return [i for i, value in enumerate(self.values) if value is None]
+
+
+class LengthCache:
+    """Persistent LRU cache of lengths of frames.
+
+    Lengths are keyed by content hash of files and processing parameters
+    (`THRESHOLD`, `SMOOTH_WINDOW`, `DETECTOR_PITCH`, library's version and given ones).
+    """
+
+    def __init__(self, filepath: str, params: dict, items: dict[str, list[float]]):
+        self.filepath = filepath
+        self.params = json.dumps(params, sort_keys=True).encode()
+        self.items = items  # key -> [length, last access time]
+
+    @classmethod
+    def load(cls, sample_name: SampleName, **params) -> 'LengthCache':
+        filepath = os.path.join(ROOT, 'data', sample_name, CACHE_DIRNAME, CACHE_FILENAME)
+
+        try:
+            with open(filepath, 'r') as file:
+                items = json.load(file)
+        except (OSError, ValueError):
+            items = {}
+
+        return cls(
+            filepath=filepath,
+            params={
+                'threshold': THRESHOLD,
+                'smooth_window': SMOOTH_WINDOW,
+                'detector_pitch': DETECTOR_PITCH,
+                'version': VERSION,
+                **params,
+            },
+            items=items,
+        )
+
+    def lookup(self, filepaths: Sequence[str]) -> Lookup:
+        """Find lengths of files in cache."""
+        now = time.time()
+
+        keys, values = [], []
+        for filepath in filepaths:
+            key = self._make_key(filepath)
+
+            item = self.items.get(key)
+            if item is not None:
+                item[1] = now
+
+            keys.append(key)
+            values.append(None if item is None else item[0])
+
+        return Lookup(
+            keys=keys,
+            values=values,
+        )
+
+    def update(self, lookup: Lookup, value: Array[MicroMeter]) -> Array[MicroMeter]:
+        """Fill lengths of files not found in cache by calculated `value` and put them to cache."""
+        now = time.time()
+
+        values = list(lookup.values)
+        for i, length in zip(lookup.missing, value, strict=True):
+            values[i] = float(length)
+            self.items[lookup.keys[i]] = [values[i], now]
+
+        return np.array(values)
+
+    def dump(self) -> None:
+        """Evict least recently used lengths and dump cache to file."""
+
+        if len(self.items) > CACHE_SIZE_MAX:
+            keys = sorted(self.items, key=lambda key: self.items[key][1], reverse=True)
+            self.items = {key: self.items[key] for key in keys[:CACHE_SIZE_MAX]}
+
+        try:
+            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+
+            with open(f'{self.filepath}.tmp', 'w') as file:
+                json.dump(self.items, file)
+            os.replace(f'{self.filepath}.tmp', self.filepath)
+
+        except OSError as error:
+            warnings.warn(f'Cache of lengths is not saved: {error}', stacklevel=2)
+
+    def _make_key(self, filepath: str) -> str:
+        digest = hashlib.blake2b(self.params, digest_size=16)
+
+        with open(filepath, 'rb') as file:
+            digest.update(file.read())
+
+        return digest.hexdigest()
+
+
+class LengthStore:
+    """Lengths of already processed files of one kind of sample in order of processing.
+
+    Files are identified by names, sizes and modification times, so new files are found without reading of files.
+    """
+
+    def __init__(self, filepath: str, params: dict, items: list[list]):
+        self.filepath = filepath
+        self.params = params
+        self.items = items  # [filename, size, mtime, length]
+        self.pending = []
+
+    @classmethod
+    def load(cls, sample_name: SampleName, filename: str, **params) -> 'LengthStore':
+        filepath = os.path.join(ROOT, 'data', sample_name, CACHE_DIRNAME, f'{filename}.lengths.json')
+        params = json.loads(json.dumps({
+            'threshold': THRESHOLD,
+            'smooth_window': SMOOTH_WINDOW,
+            'detector_pitch': DETECTOR_PITCH,
+            'version': VERSION,
+            **params,
+        }))
+
+        try:
+            with open(filepath, 'r') as file:
+                content = json.load(file)
+            items = content['items'] if content['params'] == params else []
+        except (OSError, ValueError, KeyError, TypeError):
+            items = []
+
+        return cls(
+            filepath=filepath,
+            params=params,
+            items=items,
+        )
+
+    def split(self, dirpath: str, filenames: Sequence[str]) -> list[str]:
+        """Forget removed or changed files and return names of files to be processed."""
+        key = make_key(dirpath, filenames)
+
+        current = set(key)
+        self.items = [item for item in self.items if tuple(item[:3]) in current]
+
+        processed = {tuple(item[:3]) for item in self.items}
+        self.pending = [item for item in key if item not in processed]
+
+        return [item[0] for item in self.pending]
+
+    def append(self, value: Array[MicroMeter]) -> Array[MicroMeter]:
+        """Append calculated lengths of pending files and return lengths of all files."""
+
+        for item, length in zip(self.pending, value, strict=True):
+            self.items.append([*item, float(length)])
+        self.pending = []
+
+        return np.array([item[3] for item in self.items])
+
+    def dump(self) -> None:
+
+        try:
+            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+
+            with open(f'{self.filepath}.tmp', 'w') as file:
+                json.dump({'params': self.params, 'items': self.items}, file)
+            os.replace(f'{self.filepath}.tmp', self.filepath)
+
+        except OSError as error:
+            warnings.warn(f'Store of lengths is not saved: {error}', stacklevel=2)
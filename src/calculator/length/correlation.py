@@ -0,0 +1,43 @@
+import numpy as np
+
+from calculator.profiler import profiler
+from calculator.types import Array, N, U
+
+CORRELATION_LEVEL = .25  # level of central lobe of autocorrelation (relative to zero lag) to search side lobe beyond
+
+
+def correlate(
+    y: Array[U],
+    threshold: U,
+) -> Array[N]:
+    """Calculate separation of two (near-identical) peaks of each row of `y` by its autocorrelation.
+
+    `y` is (n_frames, n_numbers) truncated intensity: clipped (NaN) samples are filled by `threshold`, background
+    (median of finite samples) is subtracted. Autocorrelation of all rows is calculated at once by FFT (zero-padded to
+    avoid wrapping), separation is the lag of side lobe maximum beyond the central lobe (see `CORRELATION_LEVEL`)
+    interpolated to sub-sample by a parabola over logarithm of three samples around the maximum.
+    Returns (n_frames, ) array of separations in samples.
+    """
+    y = np.atleast_2d(y)
+    n_frames, n_numbers = y.shape
+
+    with profiler.timer('correlate'):
+        background = np.nanmedian(y, axis=1, keepdims=True)
+        y = np.where(np.isnan(y), threshold, y) - background
+
+        spectrum = np.fft.rfft(y, n=2*n_numbers, axis=1)
+        r = np.fft.irfft(spectrum * spectrum.conj(), n=2*n_numbers, axis=1)[:, :n_numbers]
+
+    lag = np.arange(n_numbers)
+    start = np.argmax(r < CORRELATION_LEVEL*r[:, :1], axis=1)  # end of central lobe
+    index = np.argmax(np.where(lag >= start[:, np.newaxis], r, -np.inf), axis=1)
+    index = np.clip(index, 1, n_numbers - 2)
+
+    rows = np.arange(n_frames)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        left, center, right = (np.log(r[rows, index + i]) for i in (-1, 0, 1))
+        shift = (left - right) / (2*(left - 2*center + right))
+    shift = np.where(np.abs(shift) < 1, shift, 0)  # not interpolated if samples are not positive or not convex
+
+    separation = index + shift
+    return np.where(start > 0, separation, np.nan)
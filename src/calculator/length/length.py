@@ -1,11 +1,14 @@
-from collections.abc import Sequence
+import asyncio
+import dataclasses
+import os
+from collections.abc import AsyncIterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass
-from typing import Mapping, get_args
+from functools import partial
+from typing import Literal, Mapping, get_args
 
-import matplotlib.pyplot as plt
 import numpy as np
-from scipy import signal
-from tqdm.notebook import tqdm
 
 from spectrumlab.peaks.blink_peaks import (
     BlinkPeak,
@@ -15,16 +18,34 @@ from spectrumlab.peaks.blink_peaks import (
 from spectrumlab.spectra import EmittedSpectrum as Spectrum
 
 from calculator.config import (
-    DETECTOR_PITCH,
+    CACHE,
     THRESHOLD,
-    SMOOTH_WINDOW,
+    WORKERS,
     DataKind,
 )
-from calculator.data import Data, Datum
-from calculator.length.optimize import optimize, gauss
-from calculator.stats import Stats
+from calculator.data import Data, Datum, MappedData
+from calculator.data.data import read_intensity, truncate
+from calculator.length.batch import optimize_batch
+from calculator.length.cache import LengthCache, LengthStore, Lookup
+from calculator.length.correlation import correlate
+from calculator.length.optimize import estimate, fit, optimize, gauss
+from calculator.length.parallel import create_executor, gather, map_data, share, submit
+from calculator.length.params import Params
+from calculator.length.prepared import PreparedDatum
+from calculator.length.stream import STREAM_INTERVAL, watch
+from calculator.length.track import Track, TrackedPeak
+from calculator.profiler import profiler
+from calculator.progress import Progress, progress_bar
+from calculator.stats import StatsMixin
 from calculator.types import Array, Inch, MicroMeter, N, SampleName, U
 
+Engine = Literal['optimize', 'batch', 'estimate', 'correlation']
+
+TRACK_DELTA = 50  # half-width of window to search tracked peak
+TRACK_LEVEL = .5  # min intensity of maximum of tracked peak (relative to max of datum)
+BLOCK_SIZE = 64  # number of datum truncated and smoothed at once
+BATCH_AMPLITUDE_MIN = .5  # min amplitude of peak fitted in batch (relative to the first datum's fit) to be accepted
+
 
 class LengthMap(dict):
 
@@ -41,33 +62,241 @@ class LengthMap(dict):
         cls,
         sample_name: SampleName,
         show: bool = False,
+        workers: int = WORKERS,
+        engine: Engine = 'optimize',
+        warm_start: bool = False,
+        tracking: bool = False,
+        cache: bool = CACHE,
+        incremental: bool = False,
+        params: Params | None = None,
     ) -> 'LengthMap':
-
-        return cls({
-            kind: Length.calculate(
-                data=Data.load(
+        """Calculate length of all kinds of data.
+
+        Data of the next kinds are loaded in background while the current kind is calculated.
+        If `workers` > 1, all kinds are calculated by one shared pool of `workers` processes.
+        If `cache` is set, lengths of files are taken from cache (see `LengthCache`), so only new or changed files
+        are loaded and calculated (cache is not used in `show` mode, so all datum are shown).
+        If `incremental` is set, lengths of already processed files are kept in store (see `LengthStore`) and only
+        lengths of new files are calculated and appended to them (`cache` is not used).
+        """
+        params = params or Params()
+        kinds = get_args(DataKind)
+        keys = dict(engine=engine, warm_start=warm_start, tracking=tracking, **dataclasses.asdict(params))
+
+        lengths = LengthCache.load(sample_name, **keys) if cache and not incremental and not show else None
+        stores = {
+            kind: LengthStore.load(sample_name, Data._get_filename(sample_name, kind), **keys)
+            for kind in kinds
+        } if incremental else {}
+
+        with ThreadPoolExecutor(max_workers=1) as loader:
+            loads = {
+                kind: loader.submit(
+                    cls._load,
                     sample_name=sample_name,
                     kind=kind,
-                ),
-                show=show,
+                    lengths=lengths,
+                    store=stores.get(kind),
+                )
+                for kind in kinds
+            }
+
+            if workers > 1 and not show and engine not in ('batch', 'correlation'):
+                values = cls._calculate_in_parallel(
+                    loads,
+                    workers=workers,
+                    engine=engine,
+                    warm_start=warm_start,
+                    tracking=tracking,
+                    params=params,
+                )
+            else:
+                values = {
+                    kind: Length.calculate(
+                        data=loads[kind].result()[0],
+                        show=show,
+                        workers=1,
+                        engine=engine,
+                        warm_start=warm_start,
+                        tracking=tracking,
+                        params=params,
+                    ).value
+                    for kind in kinds
+                }
+
+        if lengths is not None:
+            values = {
+                kind: lengths.update(loads[kind].result()[1], value=values[kind])
+                for kind in kinds
+            }
+            lengths.dump()
+
+        if stores:
+            values = {
+                kind: stores[kind].append(values[kind])
+                for kind in kinds
+            }
+            for store in stores.values():
+                store.dump()
+
+        return cls({
+            kind: Length(
+                value=values[kind],
             )
-            for kind in get_args(DataKind)
+            for kind in kinds
         })
 
+    @classmethod
+    async def stream(
+        cls,
+        sample_name: SampleName,
+        interval: float = STREAM_INTERVAL,
+        timeout: float | None = None,
+        warm_start: bool = False,
+        tracking: bool = False,
+        params: Params | None = None,
+    ) -> AsyncIterator['LengthMap']:
+        """Calculate length of standards and stream length of sample as soon as its files are written.
+
+        Yields length map for each new file of sample, so curvature and stress can be calculated in real time.
+        """
+        params = params or Params()
+        standards = {}
+        for kind in get_args(DataKind):
+            if kind == 'sample':
+                continue
+
+            data = await asyncio.to_thread(Data.load, sample_name=sample_name, kind=kind)
+            standards[kind] = await asyncio.to_thread(
+                Length.calculate,
+                data=data,
+                workers=1,
+                warm_start=warm_start,
+                tracking=tracking,
+                params=params,
+            )
+
+        async for length in Length.stream(
+            sample_name=sample_name,
+            kind='sample',
+            interval=interval,
+            timeout=timeout,
+            warm_start=warm_start,
+            tracking=tracking,
+            params=params,
+        ):
+            yield cls({
+                kind: length if kind == 'sample' else standards[kind]
+                for kind in get_args(DataKind)
+            })
+
+    @classmethod
+    def sweep(
+        cls,
+        sample_name: SampleName,
+        grid: Sequence[Params],
+        workers: int = WORKERS,
+        engine: Engine = 'optimize',
+        warm_start: bool = False,
+        tracking: bool = False,
+    ) -> dict[Params, 'LengthMap']:
+        """Calculate length of all kinds of data for each params of grid (see `Length.sweep`).
+
+        Data of each kind are loaded once for all params.
+        """
+        kinds = get_args(DataKind)
+
+        lengths = {
+            kind: Length.sweep(
+                data=Data.load(sample_name=sample_name, kind=kind),
+                grid=grid,
+                workers=workers,
+                engine=engine,
+                warm_start=warm_start,
+                tracking=tracking,
+            )
+            for kind in kinds
+        }
+
+        return {
+            params: cls({
+                kind: lengths[kind][params]
+                for kind in kinds
+            })
+            for params in grid
+        }
+
+    @staticmethod
+    def _load(
+        sample_name: SampleName,
+        kind: DataKind,
+        lengths: LengthCache | None,
+        store: LengthStore | None = None,
+    ) -> tuple[Data, Lookup | None]:
+        """Load data of files which lengths are not found in cache or store."""
+
+        if store is not None:
+            dirpath = Data.get_dirpath(sample_name, kind)
+            filenames = store.split(dirpath, os.listdir(dirpath))
+
+            return Data.load(sample_name=sample_name, kind=kind, filenames=filenames), None
+
+        if lengths is None:
+            return Data.load(sample_name=sample_name, kind=kind), None
+
+        dirpath = Data.get_dirpath(sample_name, kind)
+        filenames = os.listdir(dirpath)
+
+        lookup = lengths.lookup([os.path.join(dirpath, _) for _ in filenames])
+        if len(lookup.missing) == len(filenames):
+            return Data.load(sample_name=sample_name, kind=kind, listing=filenames), lookup  # files arrived later are not loaded
+
+        data = Data.load(
+            sample_name=sample_name,
+            kind=kind,
+            filenames=[filenames[i] for i in lookup.missing],
+        )
+        return data, lookup
+
+    @classmethod
+    def _calculate_in_parallel(
+        cls,
+        loads: Mapping[DataKind, Future],
+        workers: int,
+        engine: Engine,
+        warm_start: bool,
+        tracking: bool,
+        params: Params,
+    ) -> dict[DataKind, Array[MicroMeter]]:
+        func = partial(calculate_lengths, params=params, engine=engine, track=Track.create(warm_start, tracking))
+
+        with ExitStack() as stack, create_executor(workers) as executor:
+            futures, descs = {}, {}
+            for kind, load in loads.items():
+                data, _ = load.result()
+
+                futures[kind], descs[kind] = [], f'{data.kind:<15}'
+                if len(data) > 0:
+                    memory = stack.enter_context(share(data))
+                    futures[kind] = submit(func, data=data, memory=memory, executor=executor, n_workers=workers)
+
+            return {
+                kind: np.array(gather(futures[kind], desc=descs[kind]))
+                for kind in loads
+            }
+
 
 @dataclass(frozen=True, slots=True)
-class Length:
+class Length(StatsMixin):
     value: MicroMeter | Array[MicroMeter]
 
-    @property
-    def stats(self) -> Stats:
-        return Stats.calculate(self.value)
-
     def show(
         self,
         figsize: tuple[Inch, Inch] | None = None,
         info: bool = False,
     ) -> None:
+        import matplotlib.pyplot as plt
+
         figsize = figsize or (6, 4)
 
         fig, ax = plt.subplots(figsize=figsize, tight_layout=True)
@@ -106,50 +335,380 @@ class Length:
     @classmethod
     def calculate(
         cls,
-        data: Data,
+        data: Data | MappedData,
         show: bool = False,
+        workers: int = WORKERS,
+        engine: Engine = 'optimize',
+        warm_start: bool = False,
+        tracking: bool = False,
+        params: Params | None = None,
     ) -> 'Length':
+        """Calculate length of each datum of data.
+
+        If `workers` > 1, data are processed in parallel by `workers` processes (except `show` mode).
+        If `engine` is 'batch', peaks of all datum are fitted at once (see `kernel_batch`).
+        If `engine` is 'estimate', peaks are not fitted but estimated in closed form (see `estimate`).
+        If `engine` is 'correlation', peaks are not searched, length of all datum is calculated at once by
+        autocorrelation (see `kernel_correlation`).
+        If `warm_start` is set, fits are seeded by the converged parameters of the previous datum.
+        If `tracking` is set, peaks are searched near the peaks of the previous datum only (see `track_peaks`).
+        """
+
+        params = params or Params()
+        if engine == 'batch':
+            return cls(
+                value=kernel_batch(
+                    data=data,
+                    params=params,
+                ),
+            )
+        if engine == 'correlation':
+            return cls(
+                value=kernel_correlation(
+                    data=data,
+                    params=params,
+                ),
+            )
 
-        value = np.array([
-            kernel(
-                datum=datum.truncate(THRESHOLD),
-                show=show,
+        if workers > 1 and not show:
+            with create_executor(workers) as executor:
+                value = np.array(map_data(
+                    partial(calculate_lengths, params=params, engine=engine, track=Track.create(warm_start, tracking)),
+                    data=data,
+                    executor=executor,
+                    n_workers=workers,
+                ))
+
+            return cls(
+                value=value,
             )
-            for datum in tqdm(data, desc=f'{data.kind:<15}')
-        ])
+
+        with progress_bar(total=len(data), desc=f'{data.kind:<15}') as progress:
+            value = np.array(calculate_lengths(
+                data=data,
+                params=params,
+                engine=engine,
+                track=Track.create(warm_start, tracking),
+                show=show,
+                progress=progress,
+            ))
+
         return cls(
             value=value,
         )
 
+    @classmethod
+    def sweep(
+        cls,
+        data: Data | MappedData,
+        grid: Sequence[Params],
+        workers: int = WORKERS,
+        engine: Engine = 'optimize',
+        warm_start: bool = False,
+        tracking: bool = False,
+    ) -> dict[Params, 'Length']:
+        """Calculate length of data for each params of grid.
+
+        Params differed by `detector_pitch` only are fitted once (see `Params.fitting`).
+        If `workers` > 1, data are shared by one pool of `workers` processes for all params.
+        """
+        groups = {}
+        for params in grid:
+            groups.setdefault(params.fitting, []).append(params)
+
+        def get_desc(params: Params) -> str:
+            return f'{data.kind} ({params.threshold:g}; {params.smooth_window:g})'
+
+        spans = {}
+        if workers > 1 and len(data) > 0:
+            with share(data) as memory, create_executor(workers) as executor:
+                futures = {
+                    params: submit(
+                        partial(calculate_lengths, params=params, engine=engine, track=Track.create(warm_start, tracking)),
+                        data=data,
+                        memory=memory,
+                        executor=executor,
+                        n_workers=workers,
+                    )
+                    for params in groups
+                }
+                for params in groups:
+                    spans[params] = np.array(gather(futures[params], desc=get_desc(params)))
+
+        else:
+            for params in groups:
+                with progress_bar(total=len(data), desc=get_desc(params)) as progress:
+                    spans[params] = np.array(calculate_lengths(
+                        data=data,
+                        params=params,
+                        engine=engine,
+                        track=Track.create(warm_start, tracking),
+                        progress=progress,
+                    ))
+
+        return {
+            params: cls(
+                value=params.detector_pitch * spans[params.fitting],
+            )
+            for params in grid
+        }
+
+    @classmethod
+    async def stream(
+        cls,
+        sample_name: SampleName,
+        kind: DataKind = 'sample',
+        interval: float = STREAM_INTERVAL,
+        timeout: float | None = None,
+        warm_start: bool = False,
+        tracking: bool = False,
+        params: Params | None = None,
+    ) -> AsyncIterator['Length']:
+        """Calculate length of each file of selected kind of sample as soon as it is written.
+
+        Yields length of all files processed so far, so `stats` are updated with each new file (see `watch`).
+        """
+        params = params or Params()
+        dirpath = Data.get_dirpath(sample_name, kind)
+        track = Track.create(warm_start, tracking)
+
+        values = []
+        async for filepath in watch(dirpath, interval=interval, timeout=timeout):
+            value = await asyncio.to_thread(calculate_file, filepath, params=params, track=track)
+            values.append(value)
+
+            yield cls(
+                value=np.array(values),
+            )
+
     def __str__(self) -> str:
         return '[{}]'.format(
             '; '.join(map(str, self.value)),
         )
 
 
-def kernel(
-    datum: Datum,
-    pitch: MicroMeter = DETECTOR_PITCH,
+def calculate_lengths(
+    data: Data | MappedData,
+    params: Params | None = None,
+    track: Track | None = None,
     show: bool = False,
+    progress: Progress | None = None,
+    engine: Engine = 'optimize',
+) -> list[MicroMeter]:
+    """Calculate length of each not truncated datum of data.
+
+    Datum are truncated and smoothed at once by blocks of `BLOCK_SIZE` datum: stacked intensity of datum is truncated in
+    place (blocks are views of it), mapped intensity is copied by blocks.
+    If `engine` is 'correlation', length of each block is calculated at once (see `correlate`) and `track` is not used.
+    """
+    params = params or Params()
+    if len(data) == 0:
+        return []
+
+    x = data[0].x
+    intensity = data.stack()
+    mapped = isinstance(data, MappedData) and intensity is data.intensity
+    if not mapped:
+        intensity = truncate(intensity, params.threshold, copy=False)
+
+    lengths = []
+    for start in range(0, len(data), BLOCK_SIZE):
+        y = intensity[:, start:start+BLOCK_SIZE]
+        if mapped:
+            y = truncate(y, params.threshold)
+        y = y.T  # (n_block, n_numbers)
+
+        if engine == 'correlation':
+            lengths.extend(params.detector_pitch * correlate(y, threshold=params.threshold))
+            if progress is not None:
+                progress.update(len(y))
+            continue
+
+        y_hat = [None]*len(y)
+        if track is None or not track.tracking:
+            y_hat = smooth_intensity(x=x, y=y, window=params.smooth_window, threshold=params.threshold)
+
+        for y_i, y_hat_i in zip(y, y_hat):
+            lengths.append(kernel(
+                datum=Datum(x=x, y=y_i),
+                params=params,
+                engine=engine,
+                show=show,
+                track=track,
+                smoothed=y_hat_i,
+            ))
+
+            if progress is not None:
+                progress.update()
+
+    return lengths
+
+
+def calculate_file(
+    filepath: str,
+    params: Params | None = None,
+    track: Track | None = None,
 ) -> MicroMeter:
+    """Calculate length of datum of file."""
+    params = params or Params()
+    y = read_intensity(filepath)
+
+    data = Data(
+        [Datum(x=np.arange(len(y)), y=y)],
+        kind=os.path.basename(os.path.dirname(filepath)),
+    )
+
+    return calculate_lengths(data, params=params, track=track)[0]
 
+
+def truncate_data(
+    data: Data | MappedData,
+    threshold: U,
+) -> Array[U]:
+    """Truncate intensity of data to (n_frames, n_numbers) array.
+
+    Stacked intensity of datum is truncated in place, mapped intensity is copied once.
+    """
+    intensity = data.stack()
+    mapped = isinstance(data, MappedData) and intensity is data.intensity
+
+    return truncate(intensity, threshold, copy=mapped).T
+
+
+def kernel_batch(
+    data: Data | MappedData,
+    params: Params | None = None,
+) -> Array[MicroMeter]:
+    """Calculate length of all datum of data at once.
+
+    Peaks are found and fitted in the first datum only, then peaks of all datum are stacked to
+    (n_frames, n_peaks, n_counts) array and fitted by vectorized optimizer seeded by the first datum's fit.
+    Datum with any peak not fitted (not succeeded, stopped at the bound of position or lost, see `BATCH_AMPLITUDE_MIN`)
+    are refitted one by one (see `kernel`).
+    """
+    params = params or Params()
+    if len(data) == 0:
+        return np.array([])
+
+    x = np.asarray(data[0].x, dtype=float)
+    y = truncate_data(data, params.threshold)  # (n_frames, n_numbers)
+
+    reference = PreparedDatum.create(Datum(x=data[0].x, y=y[0]))
     peaks = find_peaks(
-        datum=datum,
-        window=SMOOTH_WINDOW,
-        show=show,
+        datum=reference,
+        window=params.smooth_window,
+        threshold=params.threshold,
     )
 
-    results = [
-        optimize(
+    n_counts = max(len(peak.number) for peak in peaks)
+    index = np.array([np.pad(peak.number, (0, n_counts - len(peak.number)), mode='edge') for peak in peaks])
+    padded = np.arange(n_counts) >= np.array([[len(peak.number)] for peak in peaks])
+
+    xs = x[index]  # (n_peaks, n_counts)
+    ys = y[:, index]  # (n_frames, n_peaks, n_counts)
+    ys[:, padded] = np.nan
+
+    x0 = np.array([optimize(datum=reference, peak=peak, width=params.smooth_window)['x'] for peak in peaks])  # seed all frames by reference fit
+
+    position = np.array([np.mean(peak.maxima) for peak in peaks])
+    background_min, background_max = np.nanpercentile(y, [0, 50], axis=1)[..., np.newaxis]
+    lower = np.stack(np.broadcast_arrays(position - 100, 10, 0, background_min), axis=-1)
+    upper = np.stack(np.broadcast_arrays(position + 100, np.inf, np.inf, np.maximum(background_max, np.nextafter(background_min, np.inf))), axis=-1)
+
+    fitted, success = optimize_batch(xs, ys, x0=x0, lower=lower, upper=upper)
+    positions = fitted[..., 0]
+    lengths = params.detector_pitch * (np.max(positions, axis=-1) - np.min(positions, axis=-1))
+
+    failed = ~success | (fitted[..., 2] < BATCH_AMPLITUDE_MIN*x0[:, 2])
+    failed |= np.isclose(positions, lower[..., 0]) | np.isclose(positions, upper[..., 0])
+    refitted = np.flatnonzero(np.any(failed, axis=-1))
+    for i in refitted:
+        lengths[i] = kernel(
+            datum=Datum(x=data[0].x, y=y[i]),
+            params=params,
+        )
+    profiler.count('kernel_batch', refitted=len(refitted))
+
+    return lengths
+
+
+def kernel_correlation(
+    data: Data | MappedData,
+    params: Params | None = None,
+) -> Array[MicroMeter]:
+    """Calculate length of all datum of data at once by autocorrelation of datum (see `correlate`).
+
+    Peaks are not searched and fitted, so the length is a separation of two near-identical peaks of datum.
+    """
+    params = params or Params()
+    if len(data) == 0:
+        return np.array([])
+
+    y = truncate_data(data, params.threshold)  # (n_frames, n_numbers)
+
+    return params.detector_pitch * correlate(y, threshold=params.threshold)
+
+
+def kernel(
+    datum: Datum,
+    params: Params | None = None,
+    show: bool = False,
+    track: Track | None = None,
+    smoothed: Array[U] | None = None,
+    engine: Engine = 'optimize',
+) -> MicroMeter:
+    """Calculate length of truncated datum.
+
+    If `engine` is 'estimate', peaks are estimated in closed form (see `estimate`) instead of fitting.
+
+    Smoothed intensity of datum can be given by `smoothed` (see `smooth_intensity`).
+    If `track` is given, peaks are tracked and fits are warm-started from the previous datum
+    (if enabled), then the track is updated.
+    """
+    params = params or Params()
+    datum = PreparedDatum.create(datum, smoothed=smoothed)
+
+    peaks = None
+    if track is not None and track.tracking and track.peaks is not None:
+        peaks = track_peaks(
             datum=datum,
-            peak=peak,
+            peaks=track.peaks,
+            window=params.smooth_window,
         )
-        for peak in peaks
-    ]
+    if peaks is None:
+        peaks = find_peaks(
+            datum=datum,
+            window=params.smooth_window,
+            threshold=params.threshold,
+            show=show,
+        )
+
+    previous = [None]*len(peaks)
+    if track is not None and track.warm_start and track.params is not None:
+        previous = track.params
+
+    if engine == 'estimate':
+        results = [estimate(datum=datum, peak=peak) for peak in peaks]
+    else:
+        results = [
+            fit(
+                datum=datum,
+                peak=peak,
+                previous=x0,
+                width=params.smooth_window,
+            )
+            for peak, x0 in zip(peaks, previous)
+        ]
+    if track is not None:
+        track.params = [result['x'] for result in results]
+        track.peaks = peaks
+
     positions = [result['x'][0] for result in results]
-    length = pitch * (max(positions) - min(positions))
+    length = params.detector_pitch * (max(positions) - min(positions))
 
     if show:
+        import matplotlib.pyplot as plt
+
         remainder = datum.y
 
         fig, (ax_left, ax_right) = plt.subplots(ncols=2, figsize=(12, 4))
@@ -224,37 +783,47 @@ def kernel(
 
 
 def find_peaks(
-    datum: Datum,
+    datum: Datum | PreparedDatum,
     window: int,
     show: bool = False,
+    smoothed: Array[U] | None = None,
+    threshold: U = THRESHOLD,
 ) -> Sequence[BlinkPeak]:
+    datum = PreparedDatum.create(datum, smoothed=smoothed)
 
-    spectrum = Spectrum(
-        number=datum.x,
-        intensity=smooth_intensity(
+    if datum.smoothed is None:
+        datum.smoothed = smooth_intensity(
             x=datum.x,
             y=datum.y,
             window=window,
-        ),
-        clipped=np.isnan(datum.y),
-    )
+            threshold=threshold,
+        )
 
-    blinks = draft_blinks(
-        spectrum=spectrum,
-        config=DraftBlinksConfig(
-            n_counts_min=2**4,
-            n_counts_max=2**12,
-            except_clipped_peak=False,
-            # except_sloped_peak=False,
-        ),
+    spectrum = Spectrum(
+        number=datum.x,
+        intensity=datum.smoothed,
+        clipped=datum.clipped,
     )
 
+    with profiler.timer('draft_blinks'):
+        blinks = draft_blinks(
+            spectrum=spectrum,
+            config=DraftBlinksConfig(
+                n_counts_min=2**4,
+                n_counts_max=2**12,
+                except_clipped_peak=False,
+                # except_sloped_peak=False,
+            ),
+        )
+
     delta = 100
     for blink in blinks:
         left, right = blink.minima
         blink.minima = (max(left - delta, 0), min(right + delta, spectrum.n_numbers-1))
 
     if show:
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(12, 4))
 
         plt.plot(
@@ -300,21 +869,103 @@ def find_peaks(
     return blinks
 
 
+def track_peaks(
+    datum: Datum,
+    peaks: Sequence[BlinkPeak | TrackedPeak],
+    window: int,
+) -> Sequence[TrackedPeak] | None:
+    """Find peaks in small windows around maxima of peaks of the previous datum.
+
+    Returns None if any peak is lost (its maximum is at the edge of the window or lower than `TRACK_LEVEL`).
+    """
+    n_numbers = len(datum.y)
+    level = TRACK_LEVEL * np.nanmax(datum.y)
+
+    tracked = []
+    for peak in peaks:
+        left = max(int(min(peak.maxima)) - TRACK_DELTA, 0)
+        right = min(int(max(peak.maxima)) + TRACK_DELTA, n_numbers - 1)
+
+        clipped = np.isnan(datum.y[left:right+1])
+        if np.any(clipped):
+            index = np.flatnonzero(clipped)
+            lo, hi = index[0], index[-1]
+        else:
+            intensity = smooth_intensity(
+                x=datum.x[left:right+1],
+                y=datum.y[left:right+1],
+                window=window,
+            )
+            lo = hi = np.argmax(intensity)
+            if intensity[lo] < level:
+                return None
+
+        if lo == 0 or hi == right - left:
+            return None
+
+        maxima = (left + lo, left + hi)
+        shift = round(np.mean(maxima) - np.mean(peak.maxima))
+        minima = (max(peak.minima[0] + shift, 0), min(peak.minima[-1] + shift, n_numbers - 1))
+        number = np.arange(minima[0], minima[-1] + 1)
+
+        tracked.append(TrackedPeak(
+            minima=minima,
+            maxima=maxima,
+            number=number,
+            tail=np.isfinite(datum.y[number]),
+        ))
+
+    return tracked
+
+
 def smooth_intensity(
     x: Array[N],
     y: Array[U],
     window: int,
+    threshold: U = THRESHOLD,
 ) -> Array[U]:
+    """Smooth intensity by Savitzky-Golay filter.
+
+    `y` is (n_numbers, ) or (n_frames, n_numbers) array, all frames are smoothed at once.
+    NaN (clipped) values are interpolated before smoothing and are set to `threshold` after.
+    """
 
-    x = np.array(x)
-    y = np.array(y)
+    x = np.asarray(x, dtype=float)
+    y = np.array(y, dtype=float)
 
     index = np.isnan(y) | np.isinf(y)
     if np.any(index):
-        y[index] = np.interp(x[index], x[~index], y[~index])
+        interpolate(x, y, index=index)
 
-    y_hat = signal.savgol_filter(y, window_length=window, polyorder=1)
+    from scipy.signal import savgol_filter  # scipy.signal is slow to import
+
+    with profiler.timer('savgol_filter'):
+        y_hat = savgol_filter(y, window_length=window, polyorder=1, axis=-1)
     if np.any(index):
-        y_hat[index] = THRESHOLD
+        y_hat[index] = threshold
 
     return y_hat
+
+
+def interpolate(
+    x: Array[N],
+    y: Array[U],
+    index: Array[bool],
+) -> None:
+    """Linearly interpolate `y` at `index` by its nearest not indexed values along the last axis (in place).
+
+    Values outside of not indexed ones are extrapolated by the nearest of them (as `np.interp`).
+    """
+    n_numbers = y.shape[-1]
+    numbers = np.arange(n_numbers)
+
+    left = np.maximum.accumulate(np.where(index, -1, numbers), axis=-1)
+    right = np.minimum.accumulate(np.where(index, n_numbers, numbers)[..., ::-1], axis=-1)[..., ::-1]
+    left, right = np.where(left < 0, right, left), np.where(right >= n_numbers, left, right)
+    left, right = np.clip(left, 0, n_numbers - 1), np.clip(right, 0, n_numbers - 1)
+
+    x_left, x_right = x[left], x[right]
+    y_left, y_right = np.take_along_axis(y, left, axis=-1), np.take_along_axis(y, right, axis=-1)
+    weight = np.divide(x - x_left, x_right - x_left, out=np.zeros(y.shape), where=x_right > x_left)
+
+    y[index] = (y_left + weight*(y_right - y_left))[index]
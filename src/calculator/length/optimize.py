@@ -1,17 +1,21 @@
 import warnings
-from functools import partial
 
 import numpy as np
-from scipy.optimize import OptimizeResult, minimize
+from scipy.optimize import OptimizeResult, least_squares
 
 from spectrumlab.peaks.blink_peaks import BlinkPeak
 
 from calculator.config import SMOOTH_WINDOW as WIDTH
 from calculator.data import Datum
+from calculator.length.prepared import PreparedDatum
+from calculator.profiler import profiler
 from calculator.types import Array, N, U
 
 warnings.filterwarnings('ignore', category=RuntimeWarning)
 
+DRIFT_MAX = 10  # max shift of peak's position from the previous frame in warm start
+ESTIMATE_LEVEL = .1  # min intensity (relative to peak's max) of samples used by closed-form estimate
+
 
 def gauss(
     x: Array[N],
@@ -24,51 +28,163 @@ def gauss(
     return f
 
 
+def gauss_jacobian(
+    x: Array[N],
+    x0: N,
+    width: N,
+    amplitude: U,
+) -> Array[U]:
+    """Jacobian of gauss by (x0, width, amplitude) parameters."""
+
+    t = (x - x0) / width
+    g = np.exp(-(1/2)*t**2)
+
+    return np.stack([
+        amplitude * g * t / width,
+        amplitude * g * t**2 / width,
+        g,
+    ], axis=-1)
+
+
 def estimate_amplitude(
-    datum: Datum,
+    datum: Datum | PreparedDatum,
     peak: BlinkPeak,
+    width: N = WIDTH,
 ) -> U:
 
     x = datum.x[peak.number[peak.tail]]
     y = datum.y[peak.number[peak.tail]]
 
     x0 = np.mean(peak.maxima)
-    g = gauss(x, x0, WIDTH, 1)
+    g = gauss(x, x0, width, 1)
 
     amplitude = np.dot(y, g) / np.dot(g, g)
     return amplitude
 
 
-def optimize(
-    datum: Datum,
+def fit(
+    datum: Datum | PreparedDatum,
     peak: BlinkPeak,
+    previous: Array[float] | None = None,
+    width: N = WIDTH,
 ) -> OptimizeResult:
+    """Fit peak warm-started from `previous` parameters if given.
+
+    Falls back to cold start if warm-started fit is not succeeded or drifts from the previous position.
+    """
+
+    if previous is not None:
+        result = optimize(
+            datum=datum,
+            peak=peak,
+            x0=previous,
+            width=width,
+        )
+        if result['success'] and abs(result['x'][0] - previous[0]) <= DRIFT_MAX:
+            return result
+
+    return optimize(
+        datum=datum,
+        peak=peak,
+        width=width,
+    )
 
-    def loss(x: Array[N], y: Array[U], params) -> float:
-        y_hat = gauss(x, *params[:3]) + params[3]
 
-        return np.sqrt(np.nansum((y - y_hat)**2))
+def estimate(
+    datum: Datum | PreparedDatum,
+    peak: BlinkPeak,
+) -> OptimizeResult:
+    """Estimate gauss of peak in closed form by weighted parabola fit of log intensity (Caruana's algorithm).
+
+    Only finite (not clipped) samples of contiguous region around peak's maxima higher than `ESTIMATE_LEVEL` of peak's
+    max over background are used (so flanks of neighbour peaks are excluded), samples are weighted by intensity
+    (Guo's weights). The `x` of result is (position, width, amplitude, background) as of `optimize`.
+    """
+    datum = PreparedDatum.create(datum)
 
     position = np.mean(peak.maxima)
-    amplitude = estimate_amplitude(
-        datum=datum,
-        peak=peak,
-    )
-    result = minimize(
-        partial(loss, datum.x[peak.number], datum.y[peak.number]),
-        x0=[
-            position,
-            WIDTH,
-            amplitude,
-            np.nanpercentile(datum.y, 50),
-        ],
-        bounds=[
-            (position-100, position+100),
-            (10, None),
-            (0, None),
-            (np.nanpercentile(datum.y, 0), np.nanpercentile(datum.y, 50)),
-        ],
+    background = datum.background[1]
+
+    y = np.asarray(datum.y[peak.number], dtype=float) - background
+    below = np.flatnonzero(y <= ESTIMATE_LEVEL*np.nanmax(y, initial=0))  # clipped (NaN) samples are not below
+    center = np.searchsorted(peak.number, position)
+    start = below[below < center][-1] + 1 if np.any(below < center) else 0
+    stop = below[below > center][0] if np.any(below > center) else len(y)
+
+    number, y = peak.number[start:stop], y[start:stop]
+    mask = np.isfinite(y)
+    x, y = np.asarray(datum.x[number[mask]], dtype=float) - position, y[mask]
+    if len(x) >= 3:
+        a, b, c = np.linalg.lstsq(
+            np.stack([np.ones_like(x), x, x**2], axis=1) * y[:, np.newaxis],
+            np.log(y) * y,
+            rcond=None,
+        )[0]
+
+        shift = -b / (2*c)
+        if c < 0 and abs(shift) <= 100:
+            return OptimizeResult(
+                x=np.array([position + shift, np.sqrt(-1 / (2*c)), np.exp(a - b**2 / (4*c)), background]),
+                success=True,
+                nfev=1,
+            )
+
+    return OptimizeResult(
+        x=np.array([position, np.nan, np.nan, background]),
+        success=False,
+        nfev=1,
     )
+
+
+def optimize(
+    datum: Datum | PreparedDatum,
+    peak: BlinkPeak,
+    x0: Array[float] | None = None,
+    width: N = WIDTH,
+) -> OptimizeResult:
+    """Fit peak by gauss with background in bounded least squares sense.
+
+    Clipped (NaN) samples are excluded. The `x` of result is (position, width, amplitude, background).
+    If `x0` is not given, the initial guess is estimated from the peak (with initial `width`).
+    Datum is prepared once if it is not (see `PreparedDatum`).
+    """
+    datum = PreparedDatum.create(datum)
+
+    def residuals(params: Array[float], x: Array[N], y: Array[U]) -> Array[U]:
+        return gauss(x, *params[:3]) + params[3] - y
+
+    def jacobian(params: Array[float], x: Array[N], y: Array[U]) -> Array[U]:
+        jac = np.ones((len(x), 4))
+        jac[:, :3] = gauss_jacobian(x, *params[:3])
+
+        return jac
+
+    x = np.asarray(datum.x[peak.number], dtype=float)
+    y = np.asarray(datum.y[peak.number], dtype=float)
+    mask = datum.finite[peak.number]
+
+    position = np.mean(peak.maxima)
+    background_min, background_max = datum.background
+    if x0 is None:
+        amplitude = estimate_amplitude(
+            datum=datum,
+            peak=peak,
+            width=width,
+        )
+        x0 = [position, width, amplitude, background_max]
+
+    lower = np.array([position-100, 10, 0, background_min])
+    upper = np.array([position+100, np.inf, np.inf, max(background_max, np.nextafter(background_min, np.inf))])
+    with profiler.timer('optimize'):
+        result = least_squares(
+            residuals,
+            x0=np.clip(x0, lower, upper),
+            jac=jacobian,
+            bounds=(lower, upper),
+            args=(x[mask], y[mask]),
+            method='trf',
+        )
+    profiler.count('optimize', nfev=result['nfev'], njev=result['njev'])
     # assert res['success'], 'Optimization is not succeeded!'
 
     return result
@@ -0,0 +1,133 @@
+import multiprocessing
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from typing import TypeVar
+
+import numpy as np
+
+from calculator.data import Data, MappedData
+from calculator.progress import progress_bar
+from calculator.types import Array, N, U
+
+T = TypeVar('T')
+
+N_CHUNKS_PER_WORKER = 4
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'  # start method of worker processes
+
+
+def create_executor(workers: int) -> ProcessPoolExecutor:
+    """Create pool of `workers` processes started by `START_METHOD`.
+
+    Workers are not forked: the process is multi-threaded (loader of data, monitor of progress bar, Jupyter's kernel),
+    so forked workers may deadlock.
+    """
+
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(START_METHOD),
+    )
+
+
+@contextmanager
+def share(data: Data | MappedData) -> Iterator[SharedMemory]:
+    """Copy intensity of data to (n_numbers, n_frames) array in shared memory."""
+    n_numbers, n_frames = len(data[0].y), len(data)
+
+    memory = SharedMemory(create=True, size=8*n_numbers*n_frames)
+    try:
+        intensity = np.ndarray((n_numbers, n_frames), dtype=np.float64, buffer=memory.buf, order='F')
+        for i, datum in enumerate(data):
+            intensity[:, i] = datum.y
+        del intensity
+
+        yield memory
+
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def submit(
+    func: Callable[[MappedData], list[T]],
+    data: Data | MappedData,
+    memory: SharedMemory,
+    executor: Executor,
+    n_workers: int,
+) -> list[tuple[Future, int]]:
+    """Submit chunks of data shared in memory to worker processes of executor.
+
+    Each chunk is passed to `func` as `MappedData` view of shared memory.
+    Returns futures with their chunk sizes in original order.
+    """
+    n_frames = len(data)
+    n_chunks = min(N_CHUNKS_PER_WORKER*n_workers, n_frames)
+
+    return [
+        (
+            executor.submit(
+                _apply,
+                func,
+                name=memory.name,
+                shape=(len(data[0].y), n_frames),
+                x=np.asarray(data[0].x),
+                kind=data.kind,
+                index=slice(chunk[0], chunk[-1] + 1),
+            ),
+            len(chunk),
+        )
+        for chunk in np.array_split(np.arange(n_frames), n_chunks)
+    ]
+
+
+def gather(
+    futures: list[tuple[Future, int]],
+    desc: str,
+) -> list[T]:
+    """Wait for submitted chunks and return their results in original order."""
+
+    sizes = dict(futures)
+    with progress_bar(total=sum(sizes.values()), desc=desc) as progress:
+        for future in as_completed(sizes):
+            progress.update(sizes[future])
+
+    return [result for future, _ in futures for result in future.result()]
+
+
+def map_data(
+    func: Callable[[MappedData], list[T]],
+    data: Data | MappedData,
+    executor: Executor,
+    n_workers: int,
+) -> list[T]:
+    """Apply `func` to chunks of data in worker processes of executor.
+
+    Intensity is passed to workers through shared memory, the results are kept in original order.
+    """
+    if len(data) == 0:
+        return []
+
+    with share(data) as memory:
+        futures = submit(func, data=data, memory=memory, executor=executor, n_workers=n_workers)
+
+        return gather(futures, desc=f'{data.kind:<15}')
+
+
+def _apply(
+    func: Callable[[MappedData], list[T]],
+    name: str,
+    shape: tuple[int, int],
+    x: Array[N],
+    kind: str,
+    index: slice,
+) -> list[T]:
+
+    memory = SharedMemory(name=name)
+    intensity: Array[U] = np.ndarray(shape, dtype=np.float64, buffer=memory.buf, order='F')
+    try:
+        return func(MappedData(intensity[:, index], kind=kind, x=x))
+
+    finally:
+        del intensity
+        memory.close()
@@ -0,0 +1,31 @@
+import dataclasses
+import itertools
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from calculator.config import DETECTOR_PITCH, SMOOTH_WINDOW, THRESHOLD
+from calculator.types import MicroMeter, N, U
+
+
+@dataclass(frozen=True, slots=True)
+class Params:
+    """Processing parameters of length calculation (defaults are set by `.env`)."""
+
+    threshold: U = THRESHOLD
+    smooth_window: N = SMOOTH_WINDOW
+    detector_pitch: MicroMeter = DETECTOR_PITCH
+
+    @property
+    def fitting(self) -> 'Params':
+        """Params of fitting only (`detector_pitch` does not require refit and is set to 1)."""
+
+        return dataclasses.replace(self, detector_pitch=1)
+
+    @classmethod
+    def grid(cls, **values: Sequence) -> list['Params']:
+        """Create params of all combinations of given values (the rest of params are default)."""
+
+        return [
+            cls(**dict(zip(values, items)))
+            for items in itertools.product(*values.values())
+        ]
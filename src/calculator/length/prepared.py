@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from calculator.data import Datum
+from calculator.types import Array, N, U
+
+
+@dataclass(slots=True)
+class PreparedDatum:
+    """Datum with values shared by `find_peaks`, `estimate_amplitude` and `optimize` calculated once.
+
+    `smoothed` intensity is set by the first `find_peaks` if it is not given.
+    """
+
+    x: Array[N]
+    y: Array[U]
+    clipped: Array[bool]  # NaN (clipped) values
+    finite: Array[bool]
+    background: tuple[U, U]  # min and median of finite values
+    smoothed: Array[U] | None = None
+
+    @classmethod
+    def create(cls, datum: 'Datum | PreparedDatum', smoothed: Array[U] | None = None) -> 'PreparedDatum':
+        """Prepare datum (prepared datum is returned as is)."""
+
+        if isinstance(datum, PreparedDatum):
+            if datum.smoothed is None:
+                datum.smoothed = smoothed
+            return datum
+
+        y = datum.y
+        finite = np.isfinite(y)
+
+        background = (np.nan, np.nan)
+        if np.any(finite):
+            background = tuple(np.percentile(y[finite], [0, 50]))
+
+        return cls(
+            x=datum.x,
+            y=y,
+            clipped=np.isnan(y),
+            finite=finite,
+            background=background,
+            smoothed=smoothed,
+        )
@@ -0,0 +1,46 @@
+import asyncio
+import os
+import time
+from collections.abc import AsyncIterator
+
+STREAM_INTERVAL = 1.  # interval between polls of directory, s
+
+
+async def watch(
+    dirpath: str,
+    interval: float = STREAM_INTERVAL,
+    timeout: float | None = None,
+) -> AsyncIterator[str]:
+    """Yield paths to files of directory as soon as they are written.
+
+    Directory is polled every `interval` seconds. File is considered to be written if its size is not changed
+    between two polls. Watching is stopped if no new files are found for `timeout` seconds (never if None).
+    """
+    sizes = {}
+    processed = set()
+
+    updated = time.monotonic()
+    while True:
+        for filename in os.listdir(dirpath):
+            if filename in processed:
+                continue
+
+            filepath = os.path.join(dirpath, filename)
+            try:
+                size = os.path.getsize(filepath)
+            except OSError:  # file is removed
+                continue
+
+            if size > 0 and sizes.get(filename) == size:
+                processed.add(filename)
+                updated = time.monotonic()
+
+                yield filepath
+
+            else:
+                sizes[filename] = size
+
+        if timeout is not None and time.monotonic() - updated > timeout:
+            return
+
+        await asyncio.sleep(interval)
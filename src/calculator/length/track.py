@@ -0,0 +1,38 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from spectrumlab.peaks.blink_peaks import BlinkPeak
+
+from calculator.types import Array, N
+
+
+@dataclass(frozen=True, slots=True)
+class TrackedPeak:
+    """Peak tracked from the previous frame (has the same interface as `BlinkPeak`)."""
+
+    minima: tuple[N, N]
+    maxima: tuple[N, N]
+    number: Array[N]
+    tail: Array[bool]
+
+
+@dataclass(slots=True)
+class Track:
+    """State of calculation passed from frame to frame of data."""
+
+    warm_start: bool = False
+    tracking: bool = False
+
+    params: list[Array[float]] | None = None  # converged parameters of peaks in the previous frame
+    peaks: Sequence[BlinkPeak | TrackedPeak] | None = None  # peaks of the previous frame
+
+    @classmethod
+    def create(cls, warm_start: bool, tracking: bool) -> 'Track | None':
+
+        if warm_start or tracking:
+            return cls(
+                warm_start=warm_start,
+                tracking=tracking,
+            )
+
+        return None
@@ -0,0 +1,94 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from calculator.config import PROFILE
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+NULL = nullcontext()
+
+
+@dataclass(slots=True)
+class Record:
+    count: int = 0
+    time: float = 0.
+    counters: dict[str, int] = field(default_factory=dict)
+
+
+class Timer:
+    __slots__ = ('record', 'started_at')
+
+    def __init__(self, record: Record):
+        self.record = record
+        self.started_at = 0.
+
+    def __enter__(self) -> 'Timer':
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.record.count += 1
+        self.record.time += time.perf_counter() - self.started_at
+
+
+class Profiler:
+    """Aggregated timings and counters of stages of calculation.
+
+    Disabled profiler returns shared null context, so hooks cost one check only.
+    Stages calculated in worker processes are not profiled.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.records: dict[str, Record] = defaultdict(Record)
+
+    def timer(self, name: str) -> AbstractContextManager:
+        """Time stage in context."""
+        if not self.enabled:
+            return NULL
+
+        return Timer(self.records[name])
+
+    def count(self, name: str, **counters: int) -> None:
+        """Add counters (number of iterations, for example) to stage."""
+        if not self.enabled:
+            return
+
+        record = self.records[name]
+        for key, value in counters.items():
+            record.counters[key] = record.counters.get(key, 0) + int(value)
+
+    def reset(self) -> None:
+        self.records.clear()
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+
+        return {
+            name: {
+                'count': record.count,
+                'time': record.time,
+                **record.counters,
+            }
+            for name, record in self.records.items()
+        }
+
+    def to_json(self, filepath: str) -> None:
+
+        with open(filepath, 'w') as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+    def to_frame(self) -> 'pd.DataFrame':
+        import pandas as pd
+
+        frame = pd.DataFrame.from_dict(self.to_dict(), orient='index')
+        frame.index.name = 'stage'
+
+        return frame
+
+
+profiler = Profiler(enabled=PROFILE)
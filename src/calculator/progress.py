@@ -0,0 +1,44 @@
+import sys
+from functools import cache
+from importlib.util import find_spec
+
+from tqdm import tqdm
+
+from calculator.config import PROGRESS
+
+Progress = tqdm
+
+
+def progress_bar(*args, **kwargs) -> Progress:
+    """Create progress bar of selected kind (see `PROGRESS`).
+
+    Notebook progress bar (and ipywidgets) is imported on first use only. In 'none' mode progress bar is disabled.
+    """
+    kind = get_kind()
+
+    if kind == 'notebook':
+        from tqdm.notebook import tqdm as notebook_tqdm
+
+        return notebook_tqdm(*args, **kwargs)
+
+    return Progress(*args, disable=kind == 'none', **kwargs)
+
+
+def disable() -> None:
+    """Disable progress bars of current process (worker process of parallel processing, for example)."""
+    global PROGRESS
+
+    PROGRESS = 'none'
+    get_kind.cache_clear()
+
+
+@cache
+def get_kind() -> str:
+    """Get kind of progress bar: notebook one in Jupyter kernel (if ipywidgets are installed) or console one."""
+
+    if PROGRESS != 'auto':
+        return PROGRESS
+
+    if 'ipykernel' in sys.modules and find_spec('ipywidgets') is not None:
+        return 'notebook'
+    return 'console'
@@ -1,13 +1,16 @@
 import os
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from importlib.util import find_spec
 
 import numpy as np
 import pandas as pd
 
 from calculator import ROOT
-from calculator.config import Config
+from calculator.config import WORKERS, Config
 from calculator.curvature import Curvature
 from calculator.length import LengthMap
+from calculator.profiler import profiler
 from calculator.stress import Stress
 from calculator.types import SampleName
 
@@ -37,9 +40,15 @@ class ReportABC(ABC):
         cls,
         sample_name: SampleName,
         config: Config,
+        incremental: bool = False,
+        workers: int = WORKERS,
     ) -> None:
+        profiler.reset()  # profile of the report only
+
         length = LengthMap.calculate(
             sample_name=sample_name,
+            workers=workers,
+            incremental=incremental,
         )
         curvature = Curvature.calculate(
             length=length,
@@ -62,6 +71,7 @@ class ReportABC(ABC):
 class ReportV01(ReportABC):
 
     def publish(self) -> None:
+        frames = {}
 
         # results sheet
         frame = pd.concat([
@@ -96,11 +106,7 @@ class ReportV01(ReportABC):
         frame.index.name = ''
         frame.columns = pd.MultiIndex.from_product([[self.sample_name], frame.columns])
 
-        write(
-            frame,
-            sample_name=self.sample_name,
-            sheet_name=self.sample_name,
-        )
+        frames[self.sample_name] = frame
 
         # flat-standard sheet
         frame = pd.concat([
@@ -122,11 +128,7 @@ class ReportV01(ReportABC):
         ])
         frame.index.name = ''
 
-        write(
-            frame,
-            sample_name=self.sample_name,
-            sheet_name='I_0',
-        )
+        frames['I_0'] = frame
 
         # ref-standard sheet
         frame = pd.concat([
@@ -148,11 +150,7 @@ class ReportV01(ReportABC):
         ])
         frame.index.name = ''
 
-        write(
-            frame,
-            sample_name=self.sample_name,
-            sheet_name='I_эт',
-        )
+        frames['I_эт'] = frame
 
         # config sheet
         frame = pd.DataFrame({
@@ -165,16 +163,22 @@ class ReportV01(ReportABC):
         })
         frame.index = ['']
 
+        frames['config'] = frame
+
+        # profile sheet
+        if profiler.enabled:
+            frames['profile'] = profiler.to_frame()
+
         write(
-            frame,
+            frames,
             sample_name=self.sample_name,
-            sheet_name='config',
         )
 
 
 class ReportV02(ReportABC):
 
     def publish(self) -> None:
+        frames = {}
 
         # results sheet
         frame = pd.concat([
@@ -209,11 +213,7 @@ class ReportV02(ReportABC):
         frame.index.name = ''
         frame.columns = pd.MultiIndex.from_product([[self.sample_name], frame.columns])
 
-        write(
-            frame,
-            sample_name=self.sample_name,
-            sheet_name=self.sample_name,
-        )
+        frames[self.sample_name] = frame
 
         # flat-standard sheet
         frame = pd.concat([
@@ -235,11 +235,7 @@ class ReportV02(ReportABC):
         ])
         frame.index.name = ''
 
-        write(
-            frame,
-            sample_name=self.sample_name,
-            sheet_name='I_0',
-        )
+        frames['I_0'] = frame
 
         # h sheet
         frame = pd.concat([
@@ -258,11 +254,7 @@ class ReportV02(ReportABC):
         ])
         frame.index.name = ''
 
-        write(
-            frame,
-            sample_name=self.sample_name,
-            sheet_name='h',
-        )
+        frames['h'] = frame
 
         # config sheet
         frame = pd.DataFrame({
@@ -275,22 +267,34 @@ class ReportV02(ReportABC):
         })
         frame.index = ['']
 
+        frames['config'] = frame
+
+        # profile sheet
+        if profiler.enabled:
+            frames['profile'] = profiler.to_frame()
+
         write(
-            frame,
+            frames,
             sample_name=self.sample_name,
-            sheet_name='config',
         )
 
 
-def write(frame: pd.DataFrame, sample_name: SampleName, sheet_name: str) -> None:
-    """Write frame to selected sheet"""
+def write(frames: Mapping[str, pd.DataFrame], sample_name: SampleName) -> None:
+    """Write frames to selected sheets in one pass.
+
+    Existing report is opened once (other sheets are kept), new report is written by xlsxwriter if it is installed.
+    """
     filedir = os.path.join(ROOT, 'data', sample_name)
     filepath = os.path.join(filedir, 'report.xlsx')
 
-    mode = 'a' if os.path.isfile(filepath) else 'w'
-    if_sheet_exists = 'replace' if mode == 'a' else None
-    with pd.ExcelWriter(filepath, mode=mode, if_sheet_exists=if_sheet_exists, engine='openpyxl') as writer:
-        frame.to_excel(
-            writer,
-            sheet_name=sheet_name,
-        )
+    if os.path.isfile(filepath):
+        writer = pd.ExcelWriter(filepath, mode='a', if_sheet_exists='replace', engine='openpyxl')
+    else:
+        writer = pd.ExcelWriter(filepath, mode='w', engine='xlsxwriter' if find_spec('xlsxwriter') else 'openpyxl')
+
+    with profiler.timer('write'), writer:
+        for sheet_name, frame in frames.items():
+            frame.to_excel(
+                writer,
+                sheet_name=sheet_name,
+            )
@@ -1,8 +1,8 @@
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import ClassVar, NewType
 
 import numpy as np
-from scipy import stats
 
 from calculator.types import Array
 
@@ -21,9 +21,85 @@ class Stats:
     @classmethod
     def calculate(cls, __value: Array[T]) -> 'Stats':
         n = len(__value)
-        interval = stats.t.ppf((1 + cls.confidence_level)/2, n - 1) * np.std(__value, ddof=1) / np.sqrt(n)
 
-        return cls(np.mean(__value), interval)
+        return cls.create(np.mean(__value), np.std(__value, ddof=1), n)
+
+    @classmethod
+    def create(cls, mean: T, std: T, n: int) -> 'Stats':
+        """Create stats by mean and standard deviation of `n` values."""
+        interval = t_quantile((1 + cls.confidence_level)/2, n - 1) * std / np.sqrt(n)
+
+        return cls(mean, interval)
 
     def __str__(self) -> str:
         return fr'{np.round(self.value, N_DIGITS)} \pm {np.round(self.interval, N_DIGITS)}'
+
+
+class StatsMixin:
+    """Mixin of `stats` of `value` calculated once on first access (for frozen slotted dataclasses)."""
+
+    __slots__ = ('_stats', )
+
+    @property
+    def stats(self) -> Stats:
+        try:
+            return self._stats
+        except AttributeError:
+            object.__setattr__(self, '_stats', Stats.calculate(self.value))
+
+        return self._stats
+
+
+@dataclass(slots=True)
+class Accumulator:
+    """Online (Welford) accumulator of count, mean and sum of squared deviations of values.
+
+    Accumulators of parts of values (calculated by different processes, for example) are merged by `+`.
+    """
+    count: int = 0
+    mean: T = 0.
+    m2: T = 0.
+
+    @property
+    def stats(self) -> Stats:
+        std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+        return Stats.create(self.mean, std, self.count)
+
+    def update(self, __value: T | Array[T]) -> 'Accumulator':
+        """Update accumulator by value or array of values."""
+        value = np.asarray(__value, dtype=float).ravel()
+        if value.size == 0:
+            return self
+
+        mean = np.mean(value)
+        other = Accumulator(
+            count=value.size,
+            mean=mean,
+            m2=np.sum((value - mean)**2),
+        )
+        merged = self + other
+
+        self.count, self.mean, self.m2 = merged.count, merged.mean, merged.m2
+        return self
+
+    def __add__(self, other: 'Accumulator') -> 'Accumulator':
+        count = self.count + other.count
+        if count == 0:
+            return Accumulator()
+
+        delta = other.mean - self.mean
+
+        return Accumulator(
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta**2 * self.count * other.count / count,
+        )
+
+
+@lru_cache(maxsize=None)
+def t_quantile(q: float, df: int) -> float:
+    """Quantile of Student's t-distribution (cached by degrees of freedom)."""
+    from scipy import stats  # scipy.stats is slow to import
+
+    return stats.t.ppf(q, df)
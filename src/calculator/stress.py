@@ -1,18 +1,14 @@
 from dataclasses import dataclass
 
 from calculator.config import Config
-from calculator.stats import Stats
+from calculator.stats import StatsMixin
 from calculator.types import Array, MPa, ReciprocalMeter
 
 
 @dataclass(frozen=True, slots=True)
-class Stress:
+class Stress(StatsMixin):
     value: MPa | Array[MPa]
 
-    @property
-    def stats(self) -> Stats:
-        return Stats.calculate(self.value)
-
     @classmethod
     def calculate(cls, curvature: ReciprocalMeter | Array[ReciprocalMeter], config: Config) -> 'Stress':
         sign = config.stress_sign
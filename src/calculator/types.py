@@ -1,13 +1,15 @@
-from typing import NewType, TypeAlias
+from typing import TYPE_CHECKING, NewType, TypeAlias
 
-import pandas as pd
 from numpy.typing import NDArray
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 SampleName = NewType('SampleName', str)
 
 Array: TypeAlias = NDArray
-Frame: TypeAlias = pd.DataFrame
+Frame: TypeAlias = 'pd.DataFrame'
 
 N = NewType('N', int)
 U = NewType('U', float)
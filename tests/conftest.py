@@ -1,4 +1,6 @@
 import random
+from pathlib import Path
+from typing import get_args
 
 import numpy as np
 import pytest
@@ -6,9 +8,10 @@ import pytest
 from spectrumlab.detectors import Detector
 from spectrumlab.spectra import EmittedSpectrum as Spectrum
 
+from calculator.config import DataKind
 from calculator.data import Data, Datum
 from calculator.types import N, U
-from tests.utils import emulate_spectrum
+from tests.utils import emulate_file, emulate_spectrum
 
 
 @pytest.fixture
@@ -87,3 +90,21 @@ def data(
         ],
         kind='test',
     )
+
+
+@pytest.fixture
+def dirpaths(tmp_path, monkeypatch) -> dict[DataKind, Path]:
+    """Directories of emulated files (two per kind) of sample in temporary data directory."""
+    for module in ('calculator.config.config', 'calculator.data.data', 'calculator.length.cache', 'calculator.report.report'):
+        monkeypatch.setattr(f'{module}.ROOT', tmp_path)
+
+    dirpaths = {}
+    for kind in get_args(DataKind):
+        dirpath = Path(Data.get_dirpath('sample', kind))
+        dirpath.mkdir(parents=True)
+        for i in range(2):
+            emulate_file(dirpath, i)
+
+        dirpaths[kind] = dirpath
+
+    return dirpaths
@@ -0,0 +1,160 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from calculator.data import Data, MappedData
+from calculator.data.cache import CACHE_DIRNAME
+from calculator.data.data import truncate
+from calculator.types import Array, U
+
+
+@pytest.fixture
+def intensity(
+    n_numbers: int,
+) -> Array[U]:
+
+    return 100*np.random.rand(n_numbers, 5)
+
+
+@pytest.fixture
+def filedir(
+    tmp_path,
+    intensity: Array[U],
+) -> str:
+
+    n_numbers, n_frames = intensity.shape
+
+    (tmp_path / 'sample').mkdir()
+    for i in range(n_frames):
+        pd.DataFrame({
+            'wavelength': np.linspace(200, 800, n_numbers),
+            'intensity': intensity[:, i],
+            'crystal': 0,
+            'clipped': 0,
+        }).to_csv(
+            tmp_path / 'sample' / f'sample - {i}.txt',
+            sep='\t',
+            index=False,
+            header=False,
+        )
+
+    return str(tmp_path)
+
+
+def test_load(
+    filedir: str,
+    intensity: Array[U],
+):
+
+    loaded = Data._load(
+        filedir=filedir,
+        filename='sample',
+    )
+
+    assert loaded.shape == intensity.shape
+    assert np.allclose(  # files are loaded in directory listing order
+        loaded[:, np.argsort(loaded[0])],
+        intensity[:, np.argsort(intensity[0])],
+    )
+
+
+def test_load_with_cache(
+    filedir: str,
+    intensity: Array[U],
+):
+    n_numbers, n_frames = intensity.shape
+
+    loaded = Data._load(filedir=filedir, filename='sample', cache=True)
+    cached = Data._load(filedir=filedir, filename='sample', cache=True)
+
+    assert (Path(filedir) / CACHE_DIRNAME / 'sample.npy').is_file()
+    assert np.array_equal(loaded, cached)
+
+    pd.DataFrame({
+        'wavelength': np.linspace(200, 800, n_numbers),
+        'intensity': np.zeros(n_numbers),
+        'crystal': 0,
+        'clipped': 0,
+    }).to_csv(
+        Path(filedir) / 'sample' / f'sample - {n_frames}.txt',
+        sep='\t',
+        index=False,
+        header=False,
+    )
+    reloaded = Data._load(filedir=filedir, filename='sample', cache=True)
+
+    assert reloaded.shape == (n_numbers, n_frames + 1)
+
+
+def test_load_with_mmap(
+    filedir: str,
+    intensity: Array[U],
+):
+    n_numbers, n_frames = intensity.shape
+
+    loaded = Data._load(filedir=filedir, filename='sample', mmap=True)
+    data = MappedData(loaded, kind='sample')
+
+    assert isinstance(loaded, np.memmap)
+    assert len(data) == n_frames
+    assert all(datum.x is data.x for datum in data)
+    assert all(np.shares_memory(datum.y, loaded) for datum in data)
+    assert np.array_equal(loaded, Data._load(filedir=filedir, filename='sample'))
+
+
+def test_truncate(
+    intensity: Array[U],
+):
+    data = Data.create(intensity, kind='sample')
+
+    truncated = data.truncate(50)
+
+    assert len(truncated) == len(data)
+    assert not truncated[0].x.flags.writeable
+    assert all(datum.x is data[0].x for datum in truncated)
+    assert np.array_equal(
+        np.isnan(truncated.stack()),
+        intensity >= 50,
+    )
+    assert np.array_equal(data.stack(), intensity)  # data are not changed
+
+    truncated = MappedData(intensity, kind='sample').truncate(50)
+    assert np.array_equal(np.isnan(truncated.stack()), intensity >= 50)
+
+
+def test_truncate_in_place(
+    intensity: Array[U],
+):
+    stacked = np.array(intensity, order='F')
+
+    truncated = truncate(stacked, 50, copy=False)
+    assert truncated is stacked
+    assert np.array_equal(np.isnan(stacked), intensity >= 50)
+
+    mapped = np.array(intensity, order='F')
+    mapped.flags.writeable = False
+
+    truncated = truncate(mapped, 50, copy=False)
+    assert not np.shares_memory(truncated, mapped)  # read-only intensity is copied anyway
+    assert np.array_equal(mapped, intensity)
+
+
+def test_truncate_mapped_data(
+    intensity: Array[U],
+):
+    mapped = np.array(intensity, order='F')
+    mapped.flags.writeable = False
+    data = MappedData(mapped, kind='sample')
+
+    truncated = data.truncate(50)
+    assert truncated.intensity is mapped  # mapped intensity is not loaded to memory
+    assert all(
+        np.array_equal(np.isnan(datum.y), intensity[:, i] >= 50)
+        for i, datum in enumerate(truncated)
+    )
+    assert np.array_equal(np.isnan(truncated[1:3].stack()), intensity[:, 1:3] >= 50)
+    assert np.array_equal(np.isnan(truncated.truncate(75).stack()), intensity >= 50)
+    assert np.array_equal(np.isnan(truncated.truncate(25).stack()), intensity >= 25)
+    assert np.array_equal(data.stack(), intensity)  # data are not changed
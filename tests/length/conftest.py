@@ -1,7 +1,14 @@
+import numpy as np
 import pytest
 
+from spectrumlab.detectors import Detector
+
 from calculator.config import DETECTOR_PITCH
-from calculator.types import N
+from calculator.data import Data, Datum
+from calculator.types import Array, N, U
+from tests.utils import emulate_spectrum
+
+SHIFTS = (0, 2, -3, 25, -60, 120, 0, -240)  # drift of peaks from frame to frame is more than `DRIFT_MAX` and `TRACK_DELTA`
 
 
 @pytest.fixture
@@ -12,3 +19,62 @@ def expected(
 
     left, right = [1/4*n_numbers - delta/2, 3/4*n_numbers + delta/2]
     return DETECTOR_PITCH*(right - left)
+
+
+@pytest.fixture
+def shifts(request) -> tuple[N, ...]:
+
+    return getattr(request, 'param', SHIFTS)
+
+
+@pytest.fixture
+def deltas(
+    shifts: tuple[N, ...],
+) -> tuple[N, ...]:
+
+    return tuple(i / len(shifts) for i in range(len(shifts)))
+
+
+@pytest.fixture
+def series(
+    shifts: tuple[N, ...],
+    deltas: tuple[N, ...],
+    width: N,
+    amplitude: U,
+    background: U,
+    detector: Detector,
+    n_numbers: int,
+    n_frames: int,
+) -> Data:
+    """Data of distinct frames: peaks of each frame are shifted and separated differently."""
+
+    spectra = [
+        emulate_spectrum(
+            delta=delta,
+            width=width,
+            amplitude=amplitude,
+            background=background,
+            detector=detector,
+            n_numbers=n_numbers,
+            n_frames=n_frames,
+            shift=shift,
+        )
+        for shift, delta in zip(shifts, deltas)
+    ]
+
+    return Data(
+        [
+            Datum(x=spectrum.index, y=spectrum.intensity)
+            for spectrum in spectra
+        ],
+        kind='test',
+    )
+
+
+@pytest.fixture
+def expected_series(
+    n_numbers: int,
+    deltas: tuple[N, ...],
+) -> Array[N]:
+
+    return DETECTOR_PITCH*(n_numbers/2 + np.array(deltas))
@@ -0,0 +1,136 @@
+import os
+from pathlib import Path
+from typing import get_args
+
+import numpy as np
+import pytest
+
+from calculator.config import DataKind
+from calculator.length import LengthMap
+from calculator.length.cache import LengthCache, LengthStore
+from calculator.length.length import calculate_lengths
+from tests.utils import emulate_file
+
+
+@pytest.fixture
+def filepaths(tmp_path, monkeypatch) -> list[str]:
+    monkeypatch.setattr('calculator.length.cache.ROOT', tmp_path)
+
+    (tmp_path / 'data' / 'sample' / 'sample').mkdir(parents=True)
+
+    filepaths = []
+    for i in range(4):
+        filepath = tmp_path / 'data' / 'sample' / 'sample' / f'sample - {i}.txt'
+        filepath.write_text(f'{i}\t{i}\t0\t0\n')
+
+        filepaths.append(str(filepath))
+
+    return filepaths
+
+
+def test_length_cache(filepaths: list[str]):
+
+    lengths = LengthCache.load('sample', engine='optimize')
+    lookup = lengths.lookup(filepaths[:2])
+    assert lookup.missing == [0, 1]
+
+    value = lengths.update(lookup, value=np.array([1., 2.]))
+    assert np.all(value == [1., 2.])
+    lengths.dump()
+
+    lengths = LengthCache.load('sample', engine='optimize')
+    lookup = lengths.lookup(filepaths)
+    assert lookup.missing == [2, 3]
+
+    value = lengths.update(lookup, value=np.array([3., 4.]))
+    assert np.all(value == [1., 2., 3., 4.])
+    lengths.dump()
+
+    lengths = LengthCache.load('sample', engine='batch')
+    lookup = lengths.lookup(filepaths)
+    assert lookup.missing == [0, 1, 2, 3]
+
+
+def test_length_store(filepaths: list[str]):
+    dirpath = os.path.dirname(filepaths[0])
+    filenames = [os.path.basename(filepath) for filepath in filepaths]
+
+    store = LengthStore.load('sample', 'sample', engine='optimize')
+    assert store.split(dirpath, filenames[:2]) == filenames[:2]
+    assert np.all(store.append(np.array([1., 2.])) == [1., 2.])
+    store.dump()
+
+    store = LengthStore.load('sample', 'sample', engine='optimize')
+    assert store.split(dirpath, filenames) == filenames[2:]
+    assert np.all(store.append(np.array([3., 4.])) == [1., 2., 3., 4.])
+
+    os.remove(filepaths[0])
+    assert store.split(dirpath, filenames[1:]) == []
+    assert np.all(store.append(np.array([])) == [2., 3., 4.])
+
+
+@pytest.fixture
+def n_calculated(monkeypatch) -> list[int]:
+    """Number of datum calculated by each call of `calculate_lengths`."""
+    n_calculated = []
+
+    def spy(data, *args, **kwargs):
+        n_calculated.append(len(data))
+        return calculate_lengths(data, *args, **kwargs)
+    monkeypatch.setattr('calculator.length.length.calculate_lengths', spy)
+
+    return n_calculated
+
+
+def test_calculate_with_cache(
+    dirpaths: dict[DataKind, Path],
+    n_calculated: list[int],
+):
+    kinds = get_args(DataKind)
+
+    calculated = LengthMap.calculate('sample', workers=1, cache=True)
+    assert n_calculated == [2]*len(kinds)
+
+    n_calculated.clear()
+    emulate_file(dirpaths['sample'], 2)
+    cached = LengthMap.calculate('sample', workers=1, cache=True)
+    assert sorted(n_calculated) == [0]*(len(kinds) - 1) + [1]  # lengths of new file only are calculated
+
+    for kind in kinds:
+        assert len(cached[kind].value) == len(calculated[kind].value) + (kind == 'sample')
+        assert np.all(np.isin(calculated[kind].value, cached[kind].value))  # lengths of files are taken from cache
+
+
+def test_calculate_incremental(
+    dirpaths: dict[DataKind, Path],
+    n_calculated: list[int],
+):
+    kinds = get_args(DataKind)
+
+    calculated = LengthMap.calculate('sample', workers=1, incremental=True)
+    assert n_calculated == [2]*len(kinds)
+
+    n_calculated.clear()
+    emulate_file(dirpaths['sample'], 2)
+    appended = LengthMap.calculate('sample', workers=1, incremental=True)
+    assert sorted(n_calculated) == [0]*(len(kinds) - 1) + [1]  # length of new file only is calculated
+
+    for kind in kinds:
+        assert len(appended[kind].value) == len(calculated[kind].value) + (kind == 'sample')
+        assert np.array_equal(appended[kind].value[:len(calculated[kind].value)], calculated[kind].value)  # lengths are kept in order
+
+
+def test_calculate_with_cache_and_new_file(
+    dirpaths: dict[DataKind, Path],
+    n_calculated: list[int],
+    monkeypatch,
+):
+    lookup = LengthCache.lookup
+
+    def spy(self, filepaths):
+        emulate_file(dirpaths['sample'], 2)  # file arrives after listing of directory
+        return lookup(self, filepaths)
+    monkeypatch.setattr(LengthCache, 'lookup', spy)
+
+    length = LengthMap.calculate('sample', workers=1, cache=True)
+    assert len(length['sample'].value) == 2
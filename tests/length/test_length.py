@@ -1,9 +1,18 @@
+import threading
+import warnings
+from pathlib import Path
+from typing import get_args
+
 import numpy as np
 import pytest
 
-from calculator.data import Data
-from calculator.length import Length
-from calculator.types import N
+from calculator.config import DETECTOR_PITCH, DataKind
+from calculator.data import Data, MappedData
+from calculator.length import Length, LengthMap, Params
+from calculator.length.length import Engine, calculate_lengths, track_peaks
+from calculator.length.optimize import optimize
+from calculator.length.parallel import create_executor
+from calculator.types import Array, N
 
 
 @pytest.mark.parametrize(
@@ -21,6 +30,78 @@ def test_calculate(
     assert np.isclose(length.value, expected, rtol=1e-2)
 
 
+@pytest.mark.parametrize(
+    'delta', np.linspace(0, 1, 11), ids=str, indirect=True,
+)
+def test_calculate_estimate(
+    data: Data,
+    expected: N,
+):
+
+    length = Length.calculate(
+        data=data,
+        engine='estimate',
+    )
+
+    assert np.isclose(length.value, expected, rtol=1e-2)
+
+
+@pytest.mark.parametrize(
+    'delta', np.linspace(0, 1, 11), ids=str, indirect=True,
+)
+def test_calculate_batch(
+    data: Data,
+    expected: N,
+):
+
+    length = Length.calculate(
+        data=data,
+        engine='batch',
+    )
+
+    assert np.isclose(length.value, expected, rtol=1e-2)
+
+
+@pytest.mark.parametrize(
+    'width', [20, 50],
+)
+@pytest.mark.parametrize(
+    'amplitude', [100, 2**12],
+)
+def test_calculate_batch_series(
+    series: Data,
+    expected_series: Array[N],
+):
+
+    length = Length.calculate(
+        data=series,
+        engine='batch',
+    )
+
+    assert np.allclose(length.value, expected_series, rtol=1e-2)
+    assert np.allclose(length.value, Length.calculate(data=series, workers=1).value, rtol=0, atol=DETECTOR_PITCH/2)  # clipped wide peaks are fitted within half of sample
+
+
+@pytest.mark.parametrize(
+    'delta', np.linspace(0, 1, 11), ids=str, indirect=True,
+)
+def test_calculate_correlation(
+    data: Data,
+    expected: N,
+):
+
+    length = Length.calculate(
+        data=data,
+        engine='correlation',
+    )
+
+    assert np.isclose(length.value, expected, rtol=1e-2)
+    assert np.allclose(
+        length.value,
+        Length.sweep(data=data, grid=[Params()], workers=1, engine='correlation')[Params()].value,
+    )
+
+
 @pytest.mark.parametrize(
     'delta', [0, 1], ids=str, indirect=True,
 )
@@ -59,3 +140,203 @@ def test_calculate_with_negative_background(
     )
 
     assert np.isclose(length.value, expected, rtol=1e-2)
+
+
+@pytest.mark.parametrize(
+    'width', [20, ],
+)
+@pytest.mark.parametrize(
+    'amplitude', [100, 2**12],
+)
+def test_calculate_in_parallel(
+    series: Data,
+    expected_series: Array[N],
+):
+
+    length = Length.calculate(
+        data=series,
+        workers=2,
+    )
+
+    assert len(length.value) == len(series)
+    assert np.allclose(length.value, expected_series, rtol=1e-2)
+    assert np.array_equal(length.value, Length.calculate(data=series, workers=1).value)  # frames are in order
+
+
+@pytest.mark.parametrize(
+    'width', [20, ],
+)
+@pytest.mark.parametrize(
+    'amplitude', [100, 2**12],
+)
+def test_calculate_lengths_by_blocks(
+    series: Data,
+    monkeypatch,
+):
+    monkeypatch.setattr('calculator.length.length.BLOCK_SIZE', 3)
+
+    intensity = np.array(series.stack(), order='F')  # as intensity shared with worker processes
+    mapped = MappedData(intensity, kind=series.kind)
+
+    assert np.array_equal(calculate_lengths(mapped), calculate_lengths(series))
+    assert np.array_equal(intensity, series.stack())  # mapped intensity is not changed
+
+
+def test_create_executor():
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)  # process is multi-threaded, as while data are loaded in background
+    thread.start()
+    try:
+        with warnings.catch_warnings(record=True) as records:
+            warnings.simplefilter('always')
+
+            with create_executor(workers=2) as executor:
+                assert list(executor.map(abs, [-1, -2])) == [1, 2]
+
+    finally:
+        stop.set()
+        thread.join()
+
+    assert not [record for record in records if 'fork()' in str(record.message)]
+
+
+@pytest.mark.parametrize(
+    'width', [20, 50],
+)
+@pytest.mark.parametrize(
+    'amplitude', [100, 2**12],
+)
+def test_calculate_with_warm_start(
+    series: Data,
+    expected_series: Array[N],
+    monkeypatch,
+):
+    starts = []
+
+    def spy(*args, x0=None, **kwargs):
+        starts.append('cold' if x0 is None else 'warm')
+        return optimize(*args, x0=x0, **kwargs)
+    monkeypatch.setattr('calculator.length.optimize.optimize', spy)
+
+    length = Length.calculate(
+        data=series,
+        workers=1,
+        warm_start=True,
+    )
+
+    assert np.allclose(length.value, expected_series, rtol=1e-2)
+    assert starts.count('cold') > 2  # peaks drifted more than `DRIFT_MAX` are fitted cold (not only the first frame)
+    assert starts.count('warm') >= 2*(len(series) - 1)
+
+    monkeypatch.undo()
+    assert np.allclose(length.value, Length.calculate(data=series, workers=1).value, rtol=0, atol=DETECTOR_PITCH/2)
+
+
+@pytest.mark.parametrize(
+    'width', [20, 50],
+)
+@pytest.mark.parametrize(
+    'amplitude', [100, 2**12],
+)
+def test_calculate_with_tracking(
+    series: Data,
+    expected_series: Array[N],
+    monkeypatch,
+):
+    tracks = []
+
+    def spy(*args, **kwargs):
+        peaks = track_peaks(*args, **kwargs)
+        tracks.append(peaks is not None)
+        return peaks
+    monkeypatch.setattr('calculator.length.length.track_peaks', spy)
+
+    length = Length.calculate(
+        data=series,
+        workers=1,
+        tracking=True,
+    )
+
+    assert np.allclose(length.value, expected_series, rtol=1e-2)
+    assert len(tracks) == len(series) - 1
+    assert not all(tracks)  # peaks moved more than `TRACK_DELTA` are lost and found again
+    assert any(tracks)
+
+    monkeypatch.undo()
+    assert np.allclose(length.value, Length.calculate(data=series, workers=1).value, rtol=0, atol=DETECTOR_PITCH/2)
+
+
+@pytest.mark.parametrize(
+    'width', [20, ],
+)
+@pytest.mark.parametrize(
+    'amplitude', [100, ],
+)
+@pytest.mark.parametrize(
+    'workers', [1, 2],
+)
+def test_sweep(
+    series: Data,
+    expected_series: Array[N],
+    workers: int,
+):
+    grid = Params.grid(
+        smooth_window=[20, 30],
+        detector_pitch=[DETECTOR_PITCH, 2*DETECTOR_PITCH],
+    )
+
+    lengths = Length.sweep(
+        data=series,
+        grid=grid,
+        workers=workers,
+    )
+
+    assert list(lengths) == grid
+    for params, length in lengths.items():
+        assert np.allclose(length.value, expected_series * params.detector_pitch / DETECTOR_PITCH, rtol=1e-2)
+        assert np.allclose(length.value, Length.calculate(data=series, workers=1, params=params).value)
+
+
+def test_length_map_calculate_in_parallel(
+    dirpaths: dict[DataKind, Path],
+):
+    kinds = get_args(DataKind)
+    for filepath in dirpaths[kinds[0]].iterdir():
+        filepath.unlink()  # data of kind are empty
+
+    with warnings.catch_warnings(record=True) as records:
+        warnings.simplefilter('always')
+
+        length = LengthMap.calculate('sample', workers=2, cache=False)
+
+    assert not [record for record in records if 'fork()' in str(record.message)]  # data are loaded in background
+
+    expected = LengthMap.calculate('sample', workers=1, cache=False)
+    assert len(length[kinds[0]].value) == 0
+    for kind in kinds:
+        assert np.array_equal(length[kind].value, expected[kind].value)
+
+
+@pytest.mark.parametrize(
+    'engine', ['optimize', 'correlation'],
+)
+def test_length_map_sweep(
+    dirpaths: dict[DataKind, Path],
+    engine: Engine,
+):
+    grid = Params.grid(
+        smooth_window=[20, 30],
+    )
+
+    lengths = LengthMap.sweep(
+        'sample',
+        grid=grid,
+        workers=1,
+        engine=engine,
+    )
+
+    assert list(lengths) == grid
+    for params, length in lengths.items():
+        expected = LengthMap.calculate('sample', workers=1, engine=engine, cache=False, params=params)
+        for kind in get_args(DataKind):
+            assert np.allclose(length[kind].value, expected[kind].value, rtol=0, atol=1e-6)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from scipy.optimize import approx_fprime
+
+from calculator.config import SMOOTH_WINDOW, THRESHOLD
+from calculator.data import Data
+from calculator.length.batch import optimize_batch
+from calculator.length.length import find_peaks
+from calculator.length.optimize import DRIFT_MAX, fit, gauss, gauss_jacobian, optimize
+from calculator.length.prepared import PreparedDatum
+
+
+@pytest.mark.parametrize(
+    'params', [(1290, 20, 100), (1290.5, 50, 4), (10, 100, 2**12)], ids=str,
+)
+def test_gauss_jacobian(
+    n_numbers: int,
+    params: tuple[float, float, float],
+):
+    x = np.arange(n_numbers, dtype=float)
+
+    jac = gauss_jacobian(x, *params)
+    jac_approx = np.array([
+        approx_fprime(params, lambda p, i=i: gauss(x[i], *p), 1e-6)
+        for i in range(n_numbers)
+    ])
+
+    assert np.allclose(jac, jac_approx, rtol=1e-4, atol=1e-6*params[-1])
+
+
+def test_optimize_batch(
+    n_numbers: int,
+):
+    x = np.arange(n_numbers, dtype=float)
+    expected = np.array([
+        [[645, 20, 100, 0], [1935.5, 20, 100, 0]],
+        [[700.25, 50, 4, .1], [1800, 50, 4, .1]],
+        [[600, 100, 2**12, -.42], [2000.75, 100, 2**12, -.42]],
+    ])  # (n_frames, n_peaks, 4)
+
+    y = gauss(x, *np.moveaxis(expected[..., np.newaxis, :3], -1, 0)) + expected[..., np.newaxis, 3]
+    y[y > 100] = np.nan  # clipped
+
+    x0 = expected * [1, 1.2, .8, 1] + [5, 0, 0, 0]  # perturbed
+    lower = np.array([-np.inf, 1, 0, -1])
+    upper = np.array([np.inf, np.inf, np.inf, 1])
+    params, success = optimize_batch(x, y, x0=x0, lower=lower, upper=upper)
+
+    assert np.all(success)
+    assert np.allclose(params, expected, rtol=1e-6, atol=1e-6)
+
+
+@pytest.mark.parametrize(
+    'width', [20, 50],
+)
+@pytest.mark.parametrize(
+    'amplitude', [100, 2**12],
+)
+def test_fit_with_drift(
+    data: Data,
+):
+    datum = PreparedDatum.create(data[0].truncate(THRESHOLD))
+
+    for peak in find_peaks(datum=datum, window=SMOOTH_WINDOW):
+        cold = optimize(datum=datum, peak=peak, width=SMOOTH_WINDOW)
+
+        previous = cold['x'] + [2*DRIFT_MAX, 0, 0, 0]  # peak is drifted more than `DRIFT_MAX` from the previous frame
+        warm = optimize(datum=datum, peak=peak, x0=previous, width=SMOOTH_WINDOW)
+        drifted = not warm['success'] or abs(warm['x'][0] - previous[0]) > DRIFT_MAX  # fit of clipped peak is ill-posed and may stop near `previous`
+
+        result = fit(datum=datum, peak=peak, previous=previous, width=SMOOTH_WINDOW)
+        assert np.array_equal(result['x'], cold['x'] if drifted else warm['x'])
@@ -0,0 +1,25 @@
+import numpy as np
+
+from calculator.config import SMOOTH_WINDOW, THRESHOLD
+from calculator.data import Datum
+from calculator.length.length import find_peaks
+from calculator.length.optimize import optimize
+from calculator.length.prepared import PreparedDatum
+
+
+def test_prepared_datum(data):
+    datum = data[0].truncate(THRESHOLD)
+
+    prepared = PreparedDatum.create(datum)
+    assert np.allclose(prepared.background, np.nanpercentile(datum.y, [0, 50]))
+    assert np.all(prepared.clipped == np.isnan(datum.y))
+    assert PreparedDatum.create(prepared) is prepared
+
+    peaks = find_peaks(datum=prepared, window=SMOOTH_WINDOW)
+    assert prepared.smoothed is not None
+
+    for peak in peaks:
+        assert np.allclose(
+            optimize(datum=prepared, peak=peak)['x'],
+            optimize(datum=Datum(x=datum.x, y=datum.y), peak=peak)['x'],
+        )
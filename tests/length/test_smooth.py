@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from scipy import signal
+
+from calculator.config import THRESHOLD
+from calculator.length.length import interpolate, smooth_intensity
+
+
+@pytest.fixture
+def y(
+    n_numbers: int,
+) -> np.ndarray:
+
+    y = 100*np.random.rand(8, n_numbers)
+    y[y >= THRESHOLD] = np.nan
+    y[1, :10] = np.nan  # clipped at the edges
+    y[2, -10:] = np.nan
+
+    return y
+
+
+def test_interpolate(
+    y: np.ndarray,
+):
+    x = np.arange(y.shape[-1])
+    index = np.isnan(y)
+
+    interpolated = np.array(y)
+    interpolate(x, interpolated, index=index)
+
+    for y_i, interpolated_i, index_i in zip(y, interpolated, index):
+        expected = np.array(y_i)
+        expected[index_i] = np.interp(x[index_i], x[~index_i], y_i[~index_i])
+
+        assert np.allclose(interpolated_i, expected)
+
+
+def test_smooth_intensity(
+    y: np.ndarray,
+):
+    x = np.arange(y.shape[-1])
+
+    y_hat = smooth_intensity(x, y, window=20)
+
+    for y_i, y_hat_i in zip(y, y_hat):
+        assert np.allclose(y_hat_i, smooth_intensity(x, y_i, window=20))
+
+        index = np.isnan(y_i)
+        expected = np.array(y_i)
+        expected[index] = np.interp(x[index], x[~index], y_i[~index])
+        expected = signal.savgol_filter(expected, window_length=20, polyorder=1)
+        expected[index] = THRESHOLD
+
+        assert np.allclose(y_hat_i, expected)
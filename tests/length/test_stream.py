@@ -0,0 +1,75 @@
+import asyncio
+from pathlib import Path
+from typing import get_args
+
+import numpy as np
+
+from calculator.config import DataKind
+from calculator.length import Length, LengthMap
+from calculator.length.stream import watch
+from tests.utils import emulate_file
+
+
+def test_watch(tmp_path):
+    (tmp_path / 'sample - 0.txt').write_text('0\t0\t0\t0\n')
+
+    async def produce():
+        await asyncio.sleep(.1)
+        (tmp_path / 'sample - 1.txt').write_text('1\t1\t0\t0\n')
+        (tmp_path / 'sample - 2.txt').write_text('')  # is not written yet
+
+    async def consume() -> list[str]:
+        return [filepath async for filepath in watch(str(tmp_path), interval=.02, timeout=.3)]
+
+    async def main() -> list[str]:
+        _, filepaths = await asyncio.gather(produce(), consume())
+        return filepaths
+
+    filepaths = asyncio.run(main())
+    assert [Path(filepath).name for filepath in filepaths] == ['sample - 0.txt', 'sample - 1.txt']
+
+
+def test_length_stream(
+    dirpaths: dict[DataKind, Path],
+):
+
+    async def produce():
+        await asyncio.sleep(.2)
+        emulate_file(dirpaths['sample'], 2)
+
+    async def consume() -> list[Length]:
+        return [length async for length in Length.stream('sample', interval=.02, timeout=.5)]
+
+    async def main() -> list[Length]:
+        _, lengths = await asyncio.gather(produce(), consume())
+        return lengths
+
+    lengths = asyncio.run(main())
+    assert [len(length.value) for length in lengths] == [1, 2, 3]
+    for previous, length in zip(lengths, lengths[1:]):
+        assert np.array_equal(length.value[:-1], previous.value)  # lengths are growing
+    assert np.allclose(lengths[-1].value, lengths[-1].value[0], rtol=1e-2)
+
+
+def test_length_map_stream(
+    dirpaths: dict[DataKind, Path],
+):
+
+    async def produce():
+        await asyncio.sleep(.2)
+        emulate_file(dirpaths['sample'], 2)
+
+    async def consume() -> list[LengthMap]:
+        return [length async for length in LengthMap.stream('sample', interval=.02, timeout=.5)]
+
+    async def main() -> list[LengthMap]:
+        _, lengths = await asyncio.gather(produce(), consume())
+        return lengths
+
+    lengths = asyncio.run(main())
+    assert [len(length['sample'].value) for length in lengths] == [1, 2, 3]
+    for kind in get_args(DataKind):
+        if kind == 'sample':
+            continue
+        assert all(len(length[kind].value) == 2 for length in lengths)  # standards are calculated once
+        assert all(length[kind] is lengths[0][kind] for length in lengths)
@@ -0,0 +1,50 @@
+import dataclasses
+import sys
+from pathlib import Path
+
+import pytest
+
+from calculator.config import Config, DataKind
+from scripts.calculate import find_samples, run
+
+
+@pytest.fixture
+def filedir(tmp_path, monkeypatch) -> Path:
+    monkeypatch.setattr('scripts.calculate.ROOT', tmp_path)
+
+    filedir = tmp_path / 'data'
+    for sample_name in ('sample-1', 'sample-2', 'other'):
+        (filedir / sample_name).mkdir(parents=True)
+    (filedir / 'sample-3.txt').write_text('')
+
+    return filedir
+
+
+def test_find_samples(filedir: Path):
+
+    assert find_samples(['sample-*']) == ['sample-1', 'sample-2']  # files are skipped
+    assert find_samples(['sample-2', 'sample-*', 'other']) == ['sample-2', 'sample-1', 'other']  # samples are not duplicated
+    assert find_samples(['sample-3.txt', 'unknown']) == []
+
+
+def test_run(
+    dirpaths: dict[DataKind, Path],
+    monkeypatch,
+    capsys,
+):
+    filedir = dirpaths['sample'].parent.parent
+    monkeypatch.setattr('scripts.calculate.ROOT', filedir.parent)
+
+    config = Config(**{field.name: 1 for field in dataclasses.fields(Config)})
+    config.save('sample')
+    (filedir / 'other').mkdir()  # sample without config
+
+    monkeypatch.setattr(sys, 'argv', ['calculate', 'sample', 'other', '--workers', '2'])
+    with pytest.raises(SystemExit) as error:
+        run()
+
+    assert error.value.code == 1
+    errors = [line for line in capsys.readouterr().err.splitlines() if line.startswith(('sample:', 'other:'))]
+    assert len(errors) == 1
+    assert errors[0].startswith('other: ConfigLoadError')
+    assert (filedir / 'sample' / 'report.xlsx').exists()
@@ -0,0 +1,29 @@
+from calculator.profiler import NULL, Profiler
+
+
+def test_profiler():
+    profiler = Profiler(enabled=True)
+
+    for _ in range(3):
+        with profiler.timer('optimize'):
+            profiler.count('optimize', nfev=2, njev=1)
+
+    profile = profiler.to_dict()
+    assert profile['optimize']['count'] == 3
+    assert profile['optimize']['time'] > 0
+    assert profile['optimize']['nfev'] == 6
+    assert profile['optimize']['njev'] == 3
+
+    frame = profiler.to_frame()
+    assert list(frame.index) == ['optimize']
+
+
+def test_profiler_disabled():
+    profiler = Profiler(enabled=False)
+
+    with profiler.timer('optimize') as timer:
+        profiler.count('optimize', nfev=2)
+
+    assert profiler.timer('optimize') is NULL
+    assert timer is None
+    assert profiler.to_dict() == {}
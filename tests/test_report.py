@@ -0,0 +1,31 @@
+import dataclasses
+from collections import defaultdict
+from pathlib import Path
+
+import pandas as pd
+
+from calculator.config import Config, DataKind
+from calculator.profiler import Record, profiler
+from calculator.report import Report
+
+
+def test_report_profile(
+    dirpaths: dict[DataKind, Path],
+    monkeypatch,
+):
+    monkeypatch.setattr(profiler, 'enabled', True)
+    monkeypatch.setattr(profiler, 'records', defaultdict(Record))
+
+    config = Config(**{field.name: 1 for field in dataclasses.fields(Config)})
+    config.save('sample')
+
+    profiles = []
+    for _ in range(2):  # reports are written back to back
+        report = Report.create(sample_name='sample', config=config, workers=1)
+        report.publish()
+
+        profiles.append(pd.read_excel(dirpaths['sample'].parent / 'report.xlsx', sheet_name='profile', index_col=0))
+
+    assert profiles[0].loc['load', 'count'] == len(dirpaths)
+    assert profiles[1].loc['load', 'count'] == len(dirpaths)  # timings of the previous report are not included
+    assert 'write' not in profiles[1].index
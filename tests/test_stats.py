@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from calculator.stats import Accumulator, Stats
+
+
+@pytest.fixture
+def value() -> np.ndarray:
+
+    return 16137 + np.random.randn(100)
+
+
+def test_accumulator(value: np.ndarray):
+    expected = Stats.calculate(value)
+
+    accumulator = Accumulator()
+    for item in value:
+        accumulator.update(item)
+
+    assert accumulator.count == len(value)
+    assert accumulator.stats.value == pytest.approx(expected.value)
+    assert accumulator.stats.interval == pytest.approx(expected.interval)
+
+
+def test_accumulator_merge(value: np.ndarray):
+    expected = Stats.calculate(value)
+
+    accumulator = sum([Accumulator().update(part) for part in np.array_split(value, 7)], Accumulator())
+
+    assert accumulator.count == len(value)
+    assert accumulator.stats.value == pytest.approx(expected.value)
+    assert accumulator.stats.interval == pytest.approx(expected.interval)
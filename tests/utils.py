@@ -1,4 +1,7 @@
+from pathlib import Path
+
 import numpy as np
+import pandas as pd
 
 from spectrumlab.detectors import Detector
 from spectrumlab.noises import EmittedSpectrumNoise
@@ -20,6 +23,7 @@ def emulate_spectrum(
     n_frames: int,
     is_noised: bool = True,
     is_clipped: bool = True,
+    shift: N = 0,
 ) -> EmittedSpectrum:
 
     noise = EmittedSpectrumNoise(
@@ -27,7 +31,7 @@ def emulate_spectrum(
         n_frames=n_frames,
     )
 
-    positions = np.array([1/4*n_numbers, 3/4*n_numbers]) + np.array([-delta/2, +delta/2])
+    positions = np.array([1/4*n_numbers, 3/4*n_numbers]) + np.array([-delta/2, +delta/2]) + shift
 
     x = np.arange(n_numbers)
     intensity = np.zeros(n_numbers)
@@ -45,3 +49,29 @@ def emulate_spectrum(
         intensity=intensity,
         clipped=intensity==INTENSITY_MAX,
     )
+
+
+def emulate_file(dirpath: Path, i: int) -> None:
+    """Write emulated spectrum to i-th file of directory of data."""
+
+    spectrum = emulate_spectrum(
+        delta=0,
+        width=20,
+        amplitude=100,
+        background=0,
+        detector=Detector.BLPP369M1,
+        n_numbers=2580,
+        n_frames=100,
+    )
+
+    pd.DataFrame({
+        'wavelength': spectrum.wavelength,
+        'intensity': spectrum.intensity,
+        'crystal': 0,
+        'clipped': 0,
+    }).to_csv(
+        dirpath / f'{dirpath.name} - {i}.txt',
+        sep='\t',
+        index=False,
+        header=False,
+    )